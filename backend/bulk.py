@@ -0,0 +1,129 @@
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+import orjson
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+
+class InvalidImportBody(Exception):
+    pass
+
+
+# prepare(item) -> (filter on the natural key, update document); raises ValidationError or ValueError
+Prepare = Callable[[Any], Tuple[dict, dict]]
+
+
+async def iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Yield one parsed item per line as the body arrives; unparseable lines are yielded as the exception."""
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield _parse(line)
+    if buffer.strip():
+        yield _parse(buffer)
+
+
+def _parse(line: bytes):
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        return ValueError(f"Invalid JSON: {e}")
+
+
+async def iter_json_array(body: bytes) -> AsyncIterator[Any]:
+    try:
+        items = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise InvalidImportBody(f"Invalid JSON: {e}")
+    if not isinstance(items, list):
+        raise InvalidImportBody("Expected a JSON array")
+    for item in items:
+        yield item
+
+
+def _key(query: dict) -> tuple:
+    return tuple(sorted(query.items()))
+
+
+def _errors(error: Exception) -> List[str]:
+    if isinstance(error, ValidationError):
+        return [f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()]
+    return [str(error)]
+
+
+async def bulk_upsert(collection, items: AsyncIterator[Any], prepare: Prepare, batch_size: int = 1000) -> dict:
+    """Validate items one by one and upsert them on their natural key with unordered bulk writes.
+
+    Returns counts plus one result per item, in input order, with status inserted, updated, invalid or failed.
+    """
+    results: List[dict] = []
+    batch: List[Tuple[int, dict, dict]] = []
+    batch_keys = set()
+
+    async def flush():
+        if batch:
+            results.extend(await _write_batch(collection, batch))
+            batch.clear()
+            batch_keys.clear()
+
+    index = 0
+    async for item in items:
+        try:
+            if isinstance(item, Exception):
+                raise item
+            query, update = prepare(item)
+        except (ValidationError, ValueError, TypeError) as e:
+            results.append({"index": index, "status": "invalid", "errors": _errors(e)})
+            index += 1
+            continue
+        # Two upserts of the same key in one unordered batch could both insert
+        if _key(query) in batch_keys:
+            await flush()
+        batch.append((index, query, update))
+        batch_keys.add(_key(query))
+        if len(batch) >= batch_size:
+            await flush()
+        index += 1
+    await flush()
+
+    results.sort(key=lambda result: result["index"])
+    counts = {status: 0 for status in ("inserted", "updated", "invalid", "failed")}
+    for result in results:
+        counts[result["status"]] += 1
+    return {**counts, "results": results}
+
+
+async def _write_batch(collection, batch: List[Tuple[int, dict, dict]]) -> List[dict]:
+    operations = [UpdateOne(query, update, upsert=True) for _, query, update in batch]
+    failed: Dict[int, str] = {}
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        upserted = result.upserted_ids
+    except BulkWriteError as e:
+        # Unordered writes carry on past failures; the details say which operations failed
+        upserted = {entry["index"]: entry["_id"] for entry in e.details.get("upserted", [])}
+        failed = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+
+    # Matched documents are not reported with their _id, so look them up by natural key in one query
+    matched = [query for position, (_, query, _) in enumerate(batch) if position not in upserted and position not in failed]
+    existing = {}
+    if matched:
+        fields = list(matched[0])
+        async for document in collection.find({"$or": matched}, {field: 1 for field in fields}):
+            existing[_key({field: document.get(field) for field in fields})] = document["_id"]
+
+    results = []
+    for position, (index, query, _) in enumerate(batch):
+        if position in failed:
+            results.append({"index": index, "status": "failed", "errors": [failed[position]]})
+        elif position in upserted:
+            results.append({"index": index, "status": "inserted", "id": str(upserted[position])})
+        else:
+            document_id = existing.get(_key(query))
+            results.append({"index": index, "status": "updated", "id": str(document_id) if document_id else None})
+    return results
@@ -0,0 +1,198 @@
+import base64
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from compression import negotiate, weak_etag
+from conditional import is_not_modified, validator_headers
+from singleflight import SingleFlight
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis support is optional
+    aioredis = None
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str = ""
+    last_modified: Optional[datetime] = None
+    media_type: str = "application/json"
+    # Compressed once when the entry is built, keyed by content coding
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+    def to_response(self, request: Optional[Request] = None) -> Response:
+        headers = validator_headers(self.etag, self.last_modified)
+        encoding = None
+        if self.encodings:
+            headers["Vary"] = "Accept-Encoding"
+            encoding = negotiate(request.headers.get("accept-encoding", ""), self.encodings) if request is not None else None
+            if encoding and self.etag:
+                headers["ETag"] = weak_etag(self.etag)
+        # Negotiated first, so a 304 carries the validator and Vary of the representation the client holds
+        if request is not None and is_not_modified(request, self.etag, self.last_modified):
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return Response(content=self.encodings[encoding], media_type=self.media_type, headers=headers)
+        return Response(content=self.body, media_type=self.media_type, headers=headers)
+
+
+class MemoryCacheBackend:
+    """LRU cache with per-entry TTL, local to this process."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse, ttl: int):
+        self._entries[key] = (time.monotonic() + ttl, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete_prefix(self, prefix: str):
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+
+def dump_entry(entry: CachedResponse) -> bytes:
+    # Plain data only: whoever can write to the shared cache must not be able to run code on load
+    return json.dumps({
+        "body": base64.b64encode(entry.body).decode(),
+        "etag": entry.etag,
+        "lastModified": entry.last_modified.isoformat() if entry.last_modified else None,
+        "mediaType": entry.media_type,
+        "encodings": {encoding: base64.b64encode(body).decode() for encoding, body in entry.encodings.items()},
+    }).encode()
+
+
+def load_entry(raw: bytes) -> Optional[CachedResponse]:
+    try:
+        data = json.loads(raw)
+        return CachedResponse(
+            body=base64.b64decode(data["body"]),
+            etag=data["etag"],
+            last_modified=datetime.fromisoformat(data["lastModified"]) if data["lastModified"] else None,
+            media_type=data["mediaType"],
+            encodings={encoding: base64.b64decode(body) for encoding, body in data["encodings"].items()},
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        # Unreadable or written in an older format; treated as a miss and overwritten
+        return None
+
+
+class RedisCacheBackend:
+    """Cache stored in a Redis-compatible server so it can be shared between processes."""
+
+    def __init__(self, url: str, key_prefix: str = "portfolio:cache:"):
+        if aioredis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self.key_prefix = key_prefix
+        self._redis = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self._redis.get(self.key_prefix + key)
+        return load_entry(raw) if raw is not None else None
+
+    async def set(self, key: str, entry: CachedResponse, ttl: int):
+        await self._redis.set(self.key_prefix + key, dump_entry(entry), ex=ttl)
+
+    async def delete_prefix(self, prefix: str):
+        keys = [key async for key in self._redis.scan_iter(match=self.key_prefix + prefix + "*")]
+        if keys:
+            await self._redis.delete(*keys)
+
+
+class ResponseCache:
+    """Read-through cache of encoded GET responses, invalidated by namespace on writes."""
+
+    def __init__(self, backend, ttl: int = 300, publish: Optional[Callable[[list], Awaitable[None]]] = None):
+        self.backend = backend
+        self.ttl = ttl
+        # Tells other workers to drop the same namespaces from their own caches
+        self.publish = publish
+        # Called with each invalidated namespace, whether the write happened here or in another worker
+        self.listeners: List[Callable[[str], None]] = []
+        # Bumped on every invalidation so a load that raced a write is not stored
+        self._generations: Dict[str, int] = {}
+        # Concurrent misses for one key share a single load, so a cold or flushed cache costs one query per key
+        self._flights = SingleFlight()
+
+    @staticmethod
+    def key_for(namespace: str, request: Request) -> str:
+        # Only parameters the route declares can change the response; anything else would just split the cache
+        dependant = getattr(request.scope.get("route"), "dependant", None)
+        items = request.query_params.multi_items()
+        if dependant is not None:
+            declared = {param.alias for param in dependant.query_params}
+            items = [(name, value) for name, value in items if name in declared]
+        query = urlencode(sorted(items))
+        return f"{namespace}:{request.url.path}?{query}"
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        request: Request,
+        load: Callable[[], Awaitable[CachedResponse]],
+    ) -> CachedResponse:
+        key = self.key_for(namespace, request)
+        try:
+            entry = await self.backend.get(key)
+            if entry is not None:
+                return entry
+        except Exception as e:
+            logging.error(f"Error reading response cache: {str(e)}")
+
+        return await self._flights.do(key, lambda: self._load(namespace, key, load))
+
+    async def _load(self, namespace: str, key: str, load: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        generation = self._generations.get(namespace, 0)
+        entry = await load()
+        if self._generations.get(namespace, 0) == generation:
+            try:
+                await self.backend.set(key, entry, self.ttl)
+            except Exception as e:
+                logging.error(f"Error writing response cache: {str(e)}")
+        return entry
+
+    async def invalidate(self, *namespaces: str, broadcast: bool = True):
+        for namespace in namespaces:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            # Requests arriving after the write must not join a load that started before it
+            self._flights.forget(f"{namespace}:")
+            for listener in self.listeners:
+                listener(namespace)
+            try:
+                await self.backend.delete_prefix(f"{namespace}:")
+            except Exception as e:
+                logging.error(f"Error invalidating response cache: {str(e)}")
+        if broadcast and self.publish is not None:
+            await self.publish(list(namespaces))
+
+
+def create_cache_backend(name: str, max_entries: int, redis_url: Optional[str] = None):
+    if name == "redis":
+        if aioredis is not None and redis_url:
+            return RedisCacheBackend(redis_url)
+        logging.warning("Redis cache backend unavailable, falling back to in-memory cache")
+    return MemoryCacheBackend(max_entries=max_entries)
@@ -0,0 +1,204 @@
+import gzip
+import zlib
+from typing import Dict, Iterable, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # Brotli support is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Zstandard support is optional
+    zstandard = None
+
+
+# Server preference when the client accepts several encodings equally
+PREFERENCE = ("br", "zstd", "gzip")
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "text/")
+# Cached bodies are compressed once, so they can afford slower, denser settings than per-request compression
+CACHED_LEVELS = {"br": 9, "zstd": 12, "gzip": 9}
+DYNAMIC_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+
+
+def available_encodings() -> list:
+    supported = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    return [encoding for encoding in PREFERENCE if supported[encoding]]
+
+
+def negotiate(accept_encoding: str, offered: Iterable[str]) -> Optional[str]:
+    """Pick the offered encoding with the highest q-value in Accept-Encoding, breaking ties by server preference."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in offered:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def weak_etag(etag: str) -> str:
+    # A compressed representation is not byte-identical to the one the strong validator describes
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class Compressor:
+    def __init__(self, min_size: int = 1024, encodings: Optional[Sequence[str]] = None):
+        self.min_size = min_size
+        self.encodings = [encoding for encoding in available_encodings() if encodings is None or encoding in encodings]
+
+    def compress(self, body: bytes, encoding: str, levels: Dict[str, int] = DYNAMIC_LEVELS) -> bytes:
+        level = levels[encoding]
+        if encoding == "br":
+            return brotli.compress(body, quality=level)
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=level).compress(body)
+        return gzip.compress(body, compresslevel=level, mtime=0)
+
+    def precompress(self, body: bytes) -> Dict[str, bytes]:
+        """Every enabled encoding of a body that will be served many times; empty below the size threshold."""
+        if len(body) < self.min_size:
+            return {}
+        return {encoding: self.compress(body, encoding, CACHED_LEVELS) for encoding in self.encodings}
+
+    def stream(self, encoding: str):
+        level = DYNAMIC_LEVELS[encoding]
+        if encoding == "br":
+            return _BrotliStream(level)
+        if encoding == "zstd":
+            return _ZstdStream(level)
+        return _GzipStream(level)
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        # Flushing each chunk keeps streamed exports arriving incrementally
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing text responses with the best encoding the client accepts.
+
+    Responses that already carry Content-Encoding (precompressed cache entries) pass through untouched.
+    """
+
+    def __init__(self, app, compressor: Compressor):
+        self.app = app
+        self.compressor = compressor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.compressor.encodings)
+        start = None
+        passthrough = False
+        stream = None
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough, stream
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is not None:
+                chunk = stream.compress(body) if body else b""
+                if not more_body:
+                    chunk += stream.finish()
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            compressible = is_compressible(headers.get("content-type", ""))
+            # A 304 stands in for the 200 the client holds, so it gets the same Vary and validator
+            varies = compressible or start["status"] == 304
+            if varies and "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if varies and encoding is not None and "etag" in headers:
+                # Weak whenever compression was negotiated, even for bodies too small to compress, so the
+                # validator does not depend on the body size a 304 never computes
+                headers["ETag"] = weak_etag(headers["etag"])
+            if (
+                not compressible
+                or encoding is None
+                or "content-encoding" in headers
+                or start["status"] < 200
+                or start["status"] in (204, 304)
+                or (not more_body and len(body) < self.compressor.min_size)
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            if more_body:
+                # Streamed bodies (exports) are compressed chunk by chunk with no known length
+                del headers["content-length"]
+                stream = self.compressor.stream(encoding)
+                await send(start)
+                await send({"type": "http.response.body", "body": stream.compress(body), "more_body": True})
+                return
+            compressed = self.compressor.compress(body, encoding)
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
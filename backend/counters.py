@@ -0,0 +1,145 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from pymongo import UpdateOne
+
+from facets import read_facets
+from rollups import read_rollups
+
+
+# Counter documents in the statistics_counters collection, all addressed by _id:
+#   {_id: "blog_posts", total, published, featured}
+#   {_id: "testimonials", total, approved, ratingSum}
+#   {_id: "contact_submissions", total, status: {<status>: n}}
+# Per-day submission counts come from the day buckets in contact_rollups.
+BLOG_POSTS = "blog_posts"
+TESTIMONIALS = "testimonials"
+CONTACT_SUBMISSIONS = "contact_submissions"
+
+
+async def count_blog_post(counters, post: dict, delta: int = 1):
+    await counters.update_one(
+        {"_id": BLOG_POSTS},
+        {"$inc": {
+            "total": delta,
+            "published": delta if post.get("published") else 0,
+            "featured": delta if post.get("featured") else 0,
+        }},
+        upsert=True,
+    )
+
+
+async def count_testimonial(counters, testimonial: dict, delta: int = 1):
+    await counters.update_one(
+        {"_id": TESTIMONIALS},
+        {"$inc": {
+            "total": delta,
+            "approved": delta if testimonial.get("approved") else 0,
+            "ratingSum": delta * testimonial.get("rating", 0),
+        }},
+        upsert=True,
+    )
+
+
+async def count_contact_submissions(counters, submissions: Iterable[dict]):
+    """Add a batch of stored submissions to the status counters in one update."""
+    increments = defaultdict(int)
+    for submission in submissions:
+        increments["total"] += 1
+        increments[f"status.{submission.get('status', 'new')}"] += 1
+    if increments:
+        await counters.update_one({"_id": CONTACT_SUBMISSIONS}, {"$inc": dict(increments)}, upsert=True)
+
+
+async def _first(cursor) -> dict:
+    rows = await cursor.to_list(1)
+    return rows[0] if rows else {}
+
+
+async def reconcile_counters(db, counters):
+    """Recompute every counter from the source collections, correcting drift from failed or repeated writes.
+
+    Increments that land while a collection is being aggregated may be overwritten; the next run fixes them.
+    """
+    now = datetime.utcnow()
+    posts = await _first(db.blog_posts.aggregate([{"$group": {
+        "_id": None,
+        "total": {"$sum": 1},
+        "published": {"$sum": {"$cond": [{"$eq": ["$published", True]}, 1, 0]}},
+        "featured": {"$sum": {"$cond": [{"$eq": ["$featured", True]}, 1, 0]}},
+    }}]))
+    testimonials = await _first(db.testimonials.aggregate([{"$group": {
+        "_id": None,
+        "total": {"$sum": 1},
+        "approved": {"$sum": {"$cond": [{"$eq": ["$approved", True]}, 1, 0]}},
+        "ratingSum": {"$sum": "$rating"},
+    }}]))
+
+    contact = {"total": 0, "status": {}}
+    async for row in db.contact_submissions.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+        status = row["_id"] or "new"
+        contact["total"] += row["count"]
+        contact["status"][status] = contact["status"].get(status, 0) + row["count"]
+
+    operations = [
+        UpdateOne({"_id": BLOG_POSTS}, {"$set": {
+            "total": posts.get("total", 0),
+            "published": posts.get("published", 0),
+            "featured": posts.get("featured", 0),
+            "reconciledAt": now,
+        }}, upsert=True),
+        UpdateOne({"_id": TESTIMONIALS}, {"$set": {
+            "total": testimonials.get("total", 0),
+            "approved": testimonials.get("approved", 0),
+            "ratingSum": testimonials.get("ratingSum", 0),
+            "reconciledAt": now,
+        }}, upsert=True),
+        UpdateOne({"_id": CONTACT_SUBMISSIONS}, {"$set": {**contact, "reconciledAt": now}}, upsert=True),
+    ]
+    await counters.bulk_write(operations, ordered=False)
+
+
+async def ensure_counters(db, counters):
+    """Build the counters on first start against existing data."""
+    try:
+        if await counters.find_one({"_id": BLOG_POSTS}) is None:
+            await reconcile_counters(db, counters)
+    except Exception as e:
+        logging.error(f"Error bootstrapping statistics counters: {str(e)}")
+
+
+async def read_counters(counters, facets, rollups, days: int = 30) -> dict:
+    """Assemble statistics from counter, facet and rollup documents only, without scanning source collections."""
+    ids = [BLOG_POSTS, TESTIMONIALS, CONTACT_SUBMISSIONS]
+    found = {document["_id"]: document async for document in counters.find({"_id": {"$in": ids}})}
+    now = datetime.utcnow()
+    by_day = await read_rollups(rollups, "day", now - timedelta(days=days - 1), now)
+
+    posts = found.get(BLOG_POSTS, {})
+    testimonials = found.get(TESTIMONIALS, {})
+    contact = found.get(CONTACT_SUBMISSIONS, {})
+    categories = (await read_facets(facets))["categories"]
+    return {
+        "blogPosts": {
+            "total": posts.get("total", 0),
+            "published": posts.get("published", 0),
+            "featured": posts.get("featured", 0),
+            "byCategory": categories,
+        },
+        "testimonials": {
+            "total": testimonials.get("total", 0),
+            "approved": testimonials.get("approved", 0),
+            "averageRating": round(testimonials["ratingSum"] / testimonials["total"], 2) if testimonials.get("total") else None,
+        },
+        "contactSubmissions": {
+            "total": contact.get("total", 0),
+            "byStatus": contact.get("status", {}),
+            "byDay": [
+                {"day": bucket["start"].strftime("%Y-%m-%d"), "total": bucket["total"], "byStatus": bucket["byStatus"]}
+                for bucket in by_day
+            ],
+        },
+        "reconciledAt": posts.get("reconciledAt"),
+    }
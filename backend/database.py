@@ -0,0 +1,67 @@
+import os
+from typing import Optional
+
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+
+
+# Environment variable -> MongoClient option; only variables that are set are passed through
+INT_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": "maxPoolSize",
+    "MONGO_MIN_POOL_SIZE": "minPoolSize",
+    "MONGO_MAX_CONNECTING": "maxConnecting",
+    "MONGO_MAX_IDLE_TIME_MS": "maxIdleTimeMS",
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": "waitQueueTimeoutMS",
+    "MONGO_CONNECT_TIMEOUT_MS": "connectTimeoutMS",
+    "MONGO_SOCKET_TIMEOUT_MS": "socketTimeoutMS",
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": "serverSelectionTimeoutMS",
+    "MONGO_ZLIB_COMPRESSION_LEVEL": "zlibCompressionLevel",
+}
+STRING_OPTIONS = {
+    "MONGO_COMPRESSORS": "compressors",
+    "MONGO_READ_PREFERENCE": "readPreference",
+    "MONGO_APP_NAME": "appName",
+}
+
+
+def client_options_from_env(environ: Optional[dict] = None) -> dict:
+    """Pool sizing, timeouts, wire compression and read preference for AsyncIOMotorClient."""
+    environ = os.environ if environ is None else environ
+    options = {}
+    for variable, option in INT_OPTIONS.items():
+        if environ.get(variable):
+            options[option] = int(environ[variable])
+    for variable, option in STRING_OPTIONS.items():
+        if environ.get(variable):
+            options[option] = environ[variable]
+    return options
+
+
+def warmup_connection_count(options: dict, environ: Optional[dict] = None) -> int:
+    """How many connections to open before the instance reports ready."""
+    environ = os.environ if environ is None else environ
+    if environ.get("MONGO_WARMUP_CONNECTIONS"):
+        return int(environ["MONGO_WARMUP_CONNECTIONS"])
+    count = max(options.get("minPoolSize", 0), 4)
+    return min(count, options["maxPoolSize"]) if options.get("maxPoolSize") else count
+
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def public_read_preference(environ: Optional[dict] = None):
+    """Read preference for anonymous GET routes, with an optional bound on replica lag."""
+    environ = os.environ if environ is None else environ
+    mode = environ.get("MONGO_PUBLIC_READ_PREFERENCE", "secondaryPreferred")
+    if mode not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference: {mode}")
+    if mode == "primary":
+        return Primary()
+    # MongoDB rejects maxStalenessSeconds below 90; -1 means no bound
+    max_staleness = int(environ.get("MONGO_MAX_STALENESS_SECONDS", "90"))
+    return READ_PREFERENCES[mode](max_staleness=max_staleness)
@@ -0,0 +1,79 @@
+import logging
+from typing import List
+
+from pymongo import UpdateOne
+
+
+# Each facet document is {_id: "<kind>:<value>", kind, value, count} and counts published posts only
+FACET_KINDS = {"category": "categories", "tag": "tags"}
+
+
+def _facet_values(post: dict) -> List[tuple]:
+    values = []
+    if post.get("category"):
+        values.append(("category", post["category"]))
+    for tag in set(post.get("tags") or []):
+        values.append(("tag", tag))
+    return values
+
+
+async def apply_post(facets, post: dict, delta: int = 1):
+    """Add (or with delta=-1 remove) a post's category and tags to the facet counts."""
+    if not post.get("published", True):
+        return
+    operations = [
+        UpdateOne(
+            {"_id": f"{kind}:{value}"},
+            {"$inc": {"count": delta}, "$set": {"kind": kind, "value": value}},
+            upsert=True,
+        )
+        for kind, value in _facet_values(post)
+    ]
+    if operations:
+        await facets.bulk_write(operations, ordered=False)
+
+
+async def rebuild_facets(posts, facets):
+    """Recompute every facet from the posts collection; used to bootstrap and to reconcile drift."""
+    pipelines = {
+        "category": [
+            {"$match": {"published": True}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+        ],
+        "tag": [
+            {"$match": {"published": True}},
+            {"$unwind": "$tags"},
+            # A tag repeated within one post still counts that post once
+            {"$group": {"_id": {"post": "$_id", "tag": "$tags"}}},
+            {"$group": {"_id": "$_id.tag", "count": {"$sum": 1}}},
+        ],
+    }
+    counts = {}
+    for kind, pipeline in pipelines.items():
+        async for row in posts.aggregate(pipeline):
+            if row["_id"]:
+                counts[f"{kind}:{row['_id']}"] = {"kind": kind, "value": row["_id"], "count": row["count"]}
+
+    operations = [
+        UpdateOne({"_id": facet_id}, {"$set": facet}, upsert=True)
+        for facet_id, facet in counts.items()
+    ]
+    if operations:
+        await facets.bulk_write(operations, ordered=False)
+    await facets.delete_many({"_id": {"$nin": list(counts)}})
+
+
+async def ensure_facets(posts, facets):
+    """Build the facet collection on first start against existing data."""
+    try:
+        if await facets.estimated_document_count() == 0 and await posts.estimated_document_count() > 0:
+            await rebuild_facets(posts, facets)
+    except Exception as e:
+        logging.error(f"Error bootstrapping blog facets: {str(e)}")
+
+
+async def read_facets(facets) -> dict:
+    result = {key: [] for key in FACET_KINDS.values()}
+    async for facet in facets.find({"count": {"$gt": 0}}).sort([("kind", 1), ("count", -1), ("value", 1)]):
+        result[FACET_KINDS[facet["kind"]]].append({"name": facet["value"], "count": facet["count"]})
+    return result
@@ -0,0 +1,37 @@
+from typing import Any, Type
+
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def _default(obj: Any):
+    # orjson handles dicts, lists, datetimes and dataclasses natively; this hook only sees the rest
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_json(data: Any) -> bytes:
+    """Encode to JSON bytes in a single pass, converting ObjectIds and Pydantic models as they are reached."""
+    return orjson.dumps(data, default=_default)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered by orjson, used when the body is already shaped like the response model."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+def response_projection(model: Type[BaseModel]) -> dict:
+    """$project stage that returns exactly the model's fields, with _id renamed to a string id."""
+    projection = {"_id": 0}
+    for field in model.model_fields:
+        projection[field] = {"$toString": "$_id"} if field == "id" else 1
+    return {"$project": projection}
@@ -0,0 +1,15 @@
+# Multi-worker deployment: gunicorn -c gunicorn.conf.py server:app (run from backend/)
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '8001')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Each worker imports the app and opens its own MongoDB client in the startup hook
+preload_app = False
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("KEEPALIVE", "5"))
+accesslog = os.environ.get("ACCESS_LOG")
+
+# Workers keep separate in-memory caches and search indexes, so writes must be announced to the others
+os.environ.setdefault("INVALIDATION_CHANNEL", "mongo")
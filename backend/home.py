@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from cache import CachedResponse
+
+
+@dataclass
+class Section:
+    collection: str
+    # Response cache namespace invalidated by writes to the same data
+    namespace: str
+    load: Callable[[], Awaitable[object]]
+
+
+class HomeSnapshot:
+    """Materialized homepage view kept in memory and served without touching MongoDB.
+
+    Each section is reloaded on its own when its collection changes. Changes are picked up from a
+    change stream on the database, or, when change streams are unavailable (standalone mongod),
+    from response cache invalidations plus a periodic reload of every section.
+    """
+
+    def __init__(
+        self,
+        get_database: Callable,
+        sections: Dict[str, Section],
+        encode: Callable[[dict], CachedResponse],
+        poll_interval: float = 30,
+        debounce: float = 0.05,
+    ):
+        self.get_database = get_database
+        self.sections = sections
+        self.encode = encode
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.source = "starting"
+        self._data: Dict[str, object] = {}
+        self._response: Optional[CachedResponse] = None
+        self._dirty = set()
+        self._changed = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._tasks = []
+
+    async def start(self):
+        self._dirty = set(self.sections)
+        self._changed.set()
+        self._tasks = [asyncio.create_task(self._refresh_loop()), asyncio.create_task(self._watch())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def get(self, timeout: float = 5) -> Optional[CachedResponse]:
+        """The encoded snapshot, waiting up to timeout for the first build; None if it is not ready."""
+        if not self._ready.is_set():
+            waiter = asyncio.ensure_future(self._ready.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=timeout)
+            finally:
+                waiter.cancel()
+        return self._response
+
+    def mark_dirty(self, namespace: str):
+        for name, section in self.sections.items():
+            if section.namespace == namespace:
+                self._dirty.add(name)
+                self._changed.set()
+
+    def _mark_collection(self, collection: str):
+        for name, section in self.sections.items():
+            if section.collection == collection:
+                self._dirty.add(name)
+                self._changed.set()
+
+    async def _refresh_loop(self):
+        while True:
+            await self._changed.wait()
+            # Let a burst of writes settle into one reload per section
+            await asyncio.sleep(self.debounce)
+            self._changed.clear()
+            dirty, self._dirty = self._dirty, set()
+            try:
+                results = await asyncio.gather(*(self.sections[name].load() for name in dirty))
+                self._data.update(zip(dirty, results))
+                self._response = self.encode(dict(self._data))
+                self._ready.set()
+            except Exception as e:
+                logging.error(f"Error refreshing home snapshot: {str(e)}")
+                self._dirty |= dirty
+                await asyncio.sleep(1)
+                self._changed.set()
+
+    async def _watch(self):
+        collections = sorted({section.collection for section in self.sections.values()})
+        pipeline = [{"$match": {"ns.coll": {"$in": collections}}}]
+        delay = 0.5
+        while True:
+            try:
+                async with self.get_database().watch(pipeline) as stream:
+                    if self.source == "changeStream":
+                        # Changes made while disconnected were missed
+                        self._dirty = set(self.sections)
+                        self._changed.set()
+                    self.source = "changeStream"
+                    delay = 0.5
+                    async for change in stream:
+                        self._mark_collection(change["ns"]["coll"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.source != "changeStream":
+                    # Change streams need a replica set, and stand-ins may not implement them at all; any failure
+                    # before the first stream opens means reloading on a timer instead
+                    logging.info(f"Change streams unavailable for home snapshot, polling instead: {str(e)}")
+                    self.source = "polling"
+                    await self._poll()
+                    return
+                logging.error(f"Error watching home snapshot changes: {str(e)}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            self._dirty = set(self.sections)
+            self._changed.set()
@@ -0,0 +1,155 @@
+import logging
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+
+# Indexes declared per collection. Keys follow each route's filter fields first, then its sort keys,
+# so the planner can answer the query with an index scan and no in-memory SORT stage.
+INDEX_SPECS: Dict[str, List[dict]] = {
+    "blog_posts": [
+        {
+            "name": "date_id_desc",
+            "keys": [("date", DESCENDING), ("_id", DESCENDING)],
+            "routes": ["GET /api/blog-posts?published="],
+        },
+        {
+            "name": "published_date_id",
+            "keys": [("published", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)],
+            "routes": ["GET /api/blog-posts"],
+        },
+        {
+            "name": "published_category_date_id",
+            "keys": [("published", ASCENDING), ("category", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)],
+            "routes": ["GET /api/blog-posts?category="],
+        },
+        {
+            "name": "featured_published_date",
+            "keys": [("date", DESCENDING)],
+            "options": {"partialFilterExpression": {"featured": True, "published": True}},
+            "routes": ["GET /api/blog-posts/featured"],
+        },
+        {
+            "name": "title",
+            "keys": [("title", ASCENDING)],
+            "routes": ["POST /api/blog-posts/bulk"],
+        },
+    ],
+    "blog_facets": [
+        {
+            "name": "kind_count_value",
+            "keys": [("kind", ASCENDING), ("count", DESCENDING), ("value", ASCENDING)],
+            "routes": ["GET /api/blog-posts/facets", "GET /api/blog-posts/categories"],
+        },
+    ],
+    "contact_submissions": [
+        {
+            "name": "timestamp_id_desc",
+            "keys": [("timestamp", DESCENDING), ("_id", DESCENDING)],
+            "routes": ["GET /api/contact", "GET /api/contact/export"],
+        },
+        {
+            "name": "status_timestamp_id",
+            "keys": [("status", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            "routes": ["GET /api/contact?status=", "GET /api/contact/export?status="],
+        },
+    ],
+    "contact_rollups": [
+        {
+            "name": "granularity_start",
+            "keys": [("granularity", ASCENDING), ("start", ASCENDING)],
+            "routes": ["GET /api/contact/analytics", "GET /api/statistics/dynamic"],
+        },
+    ],
+    "testimonials": [
+        {
+            "name": "approved_created",
+            "keys": [("approved", ASCENDING), ("createdAt", DESCENDING)],
+            "routes": ["GET /api/testimonials"],
+        },
+        {
+            "name": "approved_featured_created",
+            "keys": [("approved", ASCENDING), ("featured", ASCENDING), ("createdAt", DESCENDING)],
+            "routes": ["GET /api/testimonials?featured="],
+        },
+        {
+            "name": "name_company",
+            "keys": [("name", ASCENDING), ("company", ASCENDING)],
+            "routes": ["POST /api/testimonials/bulk"],
+        },
+    ],
+    # Workers claim the earliest due job; a running job's runAt is its lease expiry
+    "jobs": [
+        {
+            "name": "status_run_at",
+            "keys": [("status", ASCENDING), ("runAt", ASCENDING)],
+            "routes": ["background job workers"],
+        },
+        {
+            "name": "done_expiry",
+            "keys": [("updatedAt", ASCENDING)],
+            "options": {"expireAfterSeconds": 7 * 24 * 3600, "partialFilterExpression": {"status": "done"}},
+            "routes": ["GET /api/admin/jobs"],
+        },
+    ],
+    # Markers of job side effects already applied, looked up by "<effect>:<id>"
+    "job_effects": [
+        {"name": "_id_", "keys": [("_id", ASCENDING)], "routes": ["background job workers"]},
+    ],
+    # Single-document collections are read with find_one({}) and need nothing beyond _id
+    "resume": [
+        {"name": "_id_", "keys": [("_id", ASCENDING)], "routes": ["GET /api/resume", "PUT /api/resume"]},
+    ],
+    "statistics": [
+        {"name": "_id_", "keys": [("_id", ASCENDING)], "routes": ["GET /api/statistics", "PUT /api/statistics"]},
+    ],
+    # Counters are fetched by _id, including one document per day
+    "statistics_counters": [
+        {"name": "_id_", "keys": [("_id", ASCENDING)], "routes": ["GET /api/statistics/dynamic"]},
+    ],
+}
+
+
+async def ensure_indexes(db):
+    """Create every declared index; existing indexes with the same definition are left untouched."""
+    for collection_name, specs in INDEX_SPECS.items():
+        models = [
+            IndexModel(spec["keys"], name=spec["name"], **spec.get("options", {}))
+            for spec in specs
+            if spec["name"] != "_id_"
+        ]
+        if not models:
+            continue
+        try:
+            await db[collection_name].create_indexes(models)
+        except Exception as e:
+            logging.error(f"Error creating indexes on {collection_name}: {str(e)}")
+
+
+async def index_report(db) -> dict:
+    """Describe which routes are backed by a declared index and whether it exists in MongoDB."""
+    routes = []
+    collections = {}
+    for collection_name, specs in INDEX_SPECS.items():
+        existing = await db[collection_name].index_information()
+        declared = {spec["name"] for spec in specs}
+        collections[collection_name] = {
+            "existing": sorted(existing),
+            "missing": sorted(declared - set(existing)),
+            "undeclared": sorted(set(existing) - declared - {"_id_"}),
+        }
+        for spec in specs:
+            for route in spec["routes"]:
+                routes.append({
+                    "route": route,
+                    "collection": collection_name,
+                    "index": spec["name"],
+                    "keys": [[field, direction] for field, direction in spec["keys"]],
+                    "partial": "partialFilterExpression" in spec.get("options", {}),
+                    "covered": spec["name"] in existing,
+                })
+    return {
+        "routes": routes,
+        "collections": collections,
+        "allCovered": all(route["covered"] for route in routes),
+    }
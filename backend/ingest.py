@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from bson import ObjectId, json_util
+from pymongo.errors import BulkWriteError
+
+try:
+    import fcntl
+except ImportError:  # Spool locking is only needed for multi-worker deployments on POSIX
+    fcntl = None
+
+
+class IngestQueueFull(Exception):
+    pass
+
+
+class ContactIngestQueue:
+    """Write-behind queue for contact submissions.
+
+    Submissions are appended to a local spool file and acknowledged immediately, then written
+    to MongoDB with insert_many in batches flushed on size or time. Lines are dropped from the
+    front of the spool as their batches are persisted, and whatever remains is replayed on startup
+    so nothing is lost if MongoDB was unreachable or the process stopped with submissions queued.
+
+    With several workers each one locks its own spool slot (the configured path, then
+    name.1.jsonl, name.2.jsonl, ...), which also picks up whatever a dead worker left behind.
+    """
+
+    def __init__(
+        self,
+        get_collection: Callable,
+        spool_path: Path,
+        batch_size: int = 100,
+        flush_interval: float = 0.2,
+        max_pending: int = 10000,
+        on_written: Optional[Callable[[List[dict]], Awaitable[None]]] = None,
+        on_persisted: Optional[Callable[[List[dict]], Awaitable[None]]] = None,
+    ):
+        self.get_collection = get_collection
+        # Called with each batch's newly inserted documents, e.g. to update counters
+        self.on_written = on_written
+        # Called with every document of each stored batch, including ones an earlier attempt already
+        # inserted, and retried until it succeeds before the spool drops them; it must be idempotent
+        self.on_persisted = on_persisted
+        self.spool_path = Path(spool_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._queue: "asyncio.Queue[dict]" = asyncio.Queue()
+        self._batch_ready = asyncio.Event()
+        self._spool = None
+        self._unflushed = 0
+        self._task = None
+        # Byte positions in the spool, counted from the first byte ever written to it; the file
+        # itself holds [_spool_base, _spool_end) once written prefixes are dropped
+        self._spool_base = 0
+        self._spool_end = 0
+        # Where each document not yet in MongoDB starts in the spool, in spool order
+        self._starts: Dict[ObjectId, int] = {}
+
+    @property
+    def pending(self) -> int:
+        return self._unflushed
+
+    async def start(self):
+        self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+        self._spool = self._claim_spool()
+        replayed = self._read_spool()
+        for document in replayed:
+            self._queue.put_nowait(document)
+        self._unflushed = len(replayed)
+        if replayed:
+            logging.info(f"Replaying {len(replayed)} spooled contact submissions")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            # Best effort; anything not written stays in the spool for the next start
+            await self._write(batch, retry=False)
+        if self._spool:
+            self._spool.close()
+            self._spool = None
+
+    def submit(self, document: dict) -> ObjectId:
+        """Spool and enqueue a submission, returning the _id it will be stored under."""
+        if self._unflushed >= self.max_pending:
+            raise IngestQueueFull()
+        document.setdefault("_id", ObjectId())
+        line = json_util.dumps(document) + "\n"
+        self._spool.write(line)
+        self._spool.flush()
+        self._starts[document["_id"]] = self._spool_end
+        self._spool_end += len(line.encode("utf-8"))
+        self._unflushed += 1
+        self._queue.put_nowait(document)
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+        return document["_id"]
+
+    def _claim_spool(self):
+        slot = 0
+        while True:
+            path = self.spool_path if slot == 0 else self.spool_path.with_suffix(f".{slot}{self.spool_path.suffix}")
+            spool = open(path, "a+", encoding="utf-8")
+            if fcntl is None:
+                return spool
+            try:
+                fcntl.flock(spool.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return spool
+            except BlockingIOError:
+                # Held by another live worker
+                spool.close()
+                slot += 1
+
+    def _read_spool(self) -> List[dict]:
+        documents = []
+        self._spool_base = self._spool_end = 0
+        self._starts = {}
+        self._spool.seek(0)
+        line = ""
+        for line in self._spool:
+            start = self._spool_end
+            self._spool_end += len(line.encode("utf-8"))
+            if not line.strip():
+                continue
+            try:
+                document = json_util.loads(line)
+            except ValueError:
+                # A torn final line from a crash mid-write carries no acknowledged data
+                logging.error("Skipping unreadable line in contact spool")
+                continue
+            # A crash while dropping a written prefix can leave a line twice
+            if document["_id"] not in self._starts:
+                self._starts[document["_id"]] = start
+                documents.append(document)
+        self._spool.seek(0, os.SEEK_END)
+        if line and not line.endswith("\n"):
+            # Keep the next submission off the torn line's end
+            self._spool.write("\n")
+            self._spool.flush()
+            self._spool_end += 1
+        return documents
+
+    def _drop_written_prefix(self):
+        """Remove the spool lines before the first document still waiting for MongoDB.
+
+        The remaining tail is copied over the start of the file and the file truncated, keeping the
+        open, locked handle. Only done once the tail fits within the dropped prefix, so a crash mid-copy
+        leaves the original tail intact and replay merely finds some lines twice.
+        """
+        keep_from = next(iter(self._starts.values()), self._spool_end)
+        dropped = keep_from - self._spool_base
+        tail = self._spool_end - keep_from
+        if dropped <= 0 or tail > dropped:
+            return
+        with open(self._spool.name, "r+b") as spool:
+            spool.seek(dropped)
+            data = spool.read(tail)
+            spool.seek(0)
+            spool.write(data)
+            spool.flush()
+            os.fsync(spool.fileno())
+            spool.truncate(tail)
+            os.fsync(spool.fileno())
+        self._spool_base = keep_from
+
+    async def _next_batch(self) -> List[dict]:
+        batch = [await self._queue.get()]
+        if self._queue.qsize() + 1 < self.batch_size:
+            # Linger for more submissions unless a full batch arrives first
+            waiter = asyncio.ensure_future(self._batch_ready.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=self.flush_interval)
+            finally:
+                waiter.cancel()
+        self._batch_ready.clear()
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            await self._write(batch)
+
+    async def _write(self, batch: List[dict], retry: bool = True) -> bool:
+        delay = 0.5
+        written = batch
+        while True:
+            try:
+                await self.get_collection().insert_many(batch, ordered=False)
+                break
+            except BulkWriteError as e:
+                # Duplicate keys mean the document was already written by an earlier attempt
+                if all(error.get("code") == 11000 for error in e.details.get("writeErrors", [])) and not e.details.get("writeConcernErrors"):
+                    duplicates = {error["index"] for error in e.details.get("writeErrors", [])}
+                    written = [document for index, document in enumerate(batch) if index not in duplicates]
+                    break
+                logging.error(f"Error writing contact submissions batch: {str(e)}")
+            except Exception as e:
+                logging.error(f"Error writing contact submissions batch: {str(e)}")
+            if not retry:
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+        if self.on_written and written:
+            try:
+                await self.on_written(written)
+            except Exception as e:
+                logging.error(f"Error handling written contact submissions: {str(e)}")
+
+        delay = 0.5
+        while self.on_persisted:
+            try:
+                await self.on_persisted(batch)
+                break
+            except Exception as e:
+                logging.error(f"Error handling persisted contact submissions: {str(e)}")
+            if not retry:
+                # Left in the spool; replaying it calls on_persisted again
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+        self._unflushed -= len(batch)
+        for document in batch:
+            self._starts.pop(document["_id"], None)
+        if self._spool:
+            # Dropped per flushed batch, so the spool stays bounded even if the queue never drains
+            self._drop_written_prefix()
+        return True
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import logging
+import uuid
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis support is optional
+    aioredis = None
+
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class LocalInvalidationBus:
+    """Delivers nothing to other processes; used when the API runs as a single worker."""
+
+    def __init__(self):
+        # Identifies this worker so it can skip its own events when they come back from a shared channel
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[str, List[Handler]] = {}
+
+    def subscribe(self, kind: str, handler: Handler):
+        self._handlers.setdefault(kind, []).append(handler)
+
+    async def publish(self, kind: str, **payload):
+        """Announce a change this worker has already applied locally."""
+        try:
+            await self._send({"kind": kind, "origin": self.origin, **payload})
+        except Exception as e:
+            logging.error(f"Error publishing {kind} invalidation: {str(e)}")
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def _send(self, event: dict):
+        pass
+
+    async def _dispatch(self, event: dict):
+        if event.get("origin") == self.origin:
+            return
+        for handler in self._handlers.get(event.get("kind"), []):
+            try:
+                await handler(event)
+            except Exception as e:
+                logging.error(f"Error applying {event.get('kind')} invalidation: {str(e)}")
+
+
+class MongoInvalidationBus(LocalInvalidationBus):
+    """Invalidation events written to a capped collection and tailed by every worker.
+
+    Works against a standalone mongod (unlike change streams). Handlers must be idempotent:
+    after a reconnect the tail resumes a few seconds early, so recent events may repeat.
+    """
+
+    def __init__(self, get_database: Callable, collection: str = "invalidations", size: int = 1024 * 1024):
+        super().__init__()
+        self.get_database = get_database
+        self.collection = collection
+        self.size = size
+        self._task = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._tail())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _send(self, event: dict):
+        await self.get_database()[self.collection].insert_one(event)
+
+    async def _tail(self):
+        last_id: Optional[ObjectId] = None
+        resume_from: Optional[ObjectId] = None
+        delay = 0.5
+        while True:
+            try:
+                database = self.get_database()
+                events = database[self.collection]
+                if last_id is None:
+                    try:
+                        await database.create_collection(self.collection, capped=True, size=self.size)
+                    except CollectionInvalid:
+                        pass  # Another worker created it first
+                    # Only events published after this worker started matter
+                    newest = await events.find_one({}, sort=[("$natural", -1)])
+                    last_id = resume_from = newest["_id"] if newest else ObjectId()
+                cursor = events.find({"_id": {"$gt": resume_from}}, cursor_type=CursorType.TAILABLE_AWAIT)
+                async for event in cursor:
+                    last_id = event["_id"]
+                    await self._dispatch(event)
+                delay = 0.5
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Error tailing invalidation events: {str(e)}")
+                delay = min(delay * 2, 30)
+            if last_id is not None:
+                # The cursor died (empty collection, failover); ObjectIds from different workers are only
+                # ordered to the second, so resume slightly before the last event seen
+                resume_from = ObjectId.from_datetime(last_id.generation_time - timedelta(seconds=5))
+            await asyncio.sleep(delay)
+
+
+class RedisInvalidationBus(LocalInvalidationBus):
+    """Invalidation events fanned out over Redis pub/sub."""
+
+    def __init__(self, url: str, channel: str = "portfolio:invalidations"):
+        super().__init__()
+        if aioredis is None:
+            raise RuntimeError("INVALIDATION_CHANNEL=redis requires the 'redis' package")
+        self.channel = channel
+        self._redis = aioredis.from_url(url)
+        self._task = None
+
+    async def start(self):
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self.channel)
+        self._task = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _send(self, event: dict):
+        await self._redis.publish(self.channel, json.dumps(event))
+
+    async def _listen(self, pubsub):
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    await self._dispatch(json.loads(message["data"]))
+        finally:
+            await pubsub.unsubscribe(self.channel)
+
+
+def create_invalidation_bus(name: str, get_database: Callable, redis_url: Optional[str] = None):
+    if name == "mongo":
+        return MongoInvalidationBus(get_database)
+    if name == "redis":
+        if aioredis is not None and redis_url:
+            return RedisInvalidationBus(redis_url)
+        logging.warning("Redis invalidation channel unavailable, falling back to local invalidation")
+    return LocalInvalidationBus()
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+
+
+# Job documents in the jobs collection:
+#   {_id, kind, payload, status: queued|running|done|failed, attempts, runAt, lease, lastError, createdAt, updatedAt}
+# A running job's runAt is its lease expiry, so one query on (status, runAt) finds both due jobs and
+# jobs whose worker died mid-run. Jobs from enqueue_many use "<kind>:<key>" as their _id.
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class JobQueue:
+    """Persistent background jobs run by a bounded pool of tasks in each server process.
+
+    enqueue() returns once the job is stored and wakes the local workers, so a failed insert reaches the caller.
+    Workers claim due jobs with findAndModify, so several processes can share one collection and a
+    job runs in exactly one of them at a time. A failed job is retried with exponential backoff and
+    marked failed after max_attempts. A job whose worker stops mid-run is picked up again once its
+    lease expires, so handlers must tolerate running more than once.
+    """
+
+    def __init__(
+        self,
+        get_collection: Callable,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        backoff: float = 5,
+        max_backoff: float = 3600,
+        lease: float = 300,
+        poll_interval: float = 5,
+    ):
+        self.get_collection = get_collection
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.handlers: Dict[str, Handler] = {}
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+
+    def handler(self, kind: str):
+        """Register the coroutine that runs jobs of this kind."""
+        def register(function: Handler) -> Handler:
+            self.handlers[kind] = function
+            return function
+        return register
+
+    async def enqueue(self, kind: str, payload: Optional[dict] = None, delay: float = 0) -> ObjectId:
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind {kind!r}")
+        now = datetime.utcnow()
+        job = {
+            "_id": ObjectId(),
+            "kind": kind,
+            "payload": payload or {},
+            "status": QUEUED,
+            "attempts": 0,
+            "runAt": now + timedelta(seconds=delay),
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        await self.get_collection().insert_one(job)
+        self._wakeup.set()
+        return job["_id"]
+
+    async def enqueue_many(self, kind: str, jobs: List[tuple]):
+        """Persist (key, payload) jobs with one insert, waiting for it; a key already queued is skipped.
+
+        Keys become the job _id, so repeating a call after a failure or crash never duplicates a job.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind {kind!r}")
+        if not jobs:
+            return
+        now = datetime.utcnow()
+        documents = [
+            {
+                "_id": f"{kind}:{key}",
+                "kind": kind,
+                "payload": payload,
+                "status": QUEUED,
+                "attempts": 0,
+                "runAt": now,
+                "createdAt": now,
+                "updatedAt": now,
+            }
+            for key, payload in jobs
+        ]
+        try:
+            await self.get_collection().insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])) or e.details.get("writeConcernErrors"):
+                raise
+        self._wakeup.set()
+
+    async def start(self):
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self, grace: float = 10):
+        # Idle workers exit at once and busy ones after their current job; a job still running after
+        # the grace period is cancelled and retried when its lease expires
+        self._stopping = True
+        self._wakeup.set()
+        if self._workers:
+            _, running = await asyncio.wait(self._workers, timeout=grace)
+            for worker in running:
+                worker.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+        self._workers = []
+
+    async def _run(self):
+        while not self._stopping:
+            # Cleared before claiming so a job enqueued during the claim still wakes this worker
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logging.error(f"Error claiming job: {str(e)}")
+                job = None
+            if job is None:
+                if not self._stopping:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                continue
+            await self._execute(job)
+
+    async def _claim(self) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await self.get_collection().find_one_and_update(
+            {"status": {"$in": [QUEUED, RUNNING]}, "runAt": {"$lte": now}, "kind": {"$in": list(self.handlers)}},
+            {
+                "$set": {"status": RUNNING, "runAt": now + timedelta(seconds=self.lease), "lease": uuid.uuid4().hex, "updatedAt": now},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("runAt", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _execute(self, job: dict):
+        try:
+            await asyncio.wait_for(self.handlers[job["kind"]](job["payload"]), self.lease)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._fail(job, e)
+            return
+        await self._finish(job, {"status": DONE, "updatedAt": datetime.utcnow()})
+
+    async def _fail(self, job: dict, error: Exception):
+        now = datetime.utcnow()
+        message = f"{type(error).__name__}: {error}"
+        if job["attempts"] >= self.max_attempts:
+            logging.error(f"Job {job['_id']} ({job['kind']}) failed after {job['attempts']} attempts: {message}")
+            await self._finish(job, {"status": FAILED, "lastError": message, "updatedAt": now})
+            return
+        delay = min(self.backoff * 2 ** (job["attempts"] - 1), self.max_backoff)
+        logging.warning(f"Job {job['_id']} ({job['kind']}) failed, retrying in {delay:.0f}s: {message}")
+        await self._finish(job, {"status": QUEUED, "runAt": now + timedelta(seconds=delay), "lastError": message, "updatedAt": now})
+
+    async def _finish(self, job: dict, fields: dict):
+        try:
+            # Only the holder of the current lease may settle the job
+            await self.get_collection().update_one({"_id": job["_id"], "lease": job["lease"]}, {"$set": fields})
+        except Exception as e:
+            logging.error(f"Error updating job {job['_id']}: {str(e)}")
+
+    async def summary(self, recent_failures: int = 20) -> dict:
+        collection = self.get_collection()
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        async for row in collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        failures = []
+        async for job in collection.find({"status": FAILED}).sort("updatedAt", -1).limit(recent_failures):
+            failures.append({
+                "id": str(job["_id"]),
+                "kind": job["kind"],
+                "attempts": job["attempts"],
+                "lastError": job.get("lastError"),
+                "updatedAt": job["updatedAt"],
+            })
+        return {"counts": counts, "workers": len(self._workers), "recentFailures": failures}
@@ -0,0 +1,220 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.label_names, labels)} {value}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._values.items()]
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = _labels(self.label_names, labels, 'le="%s"' % bound)
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            cumulative += series[len(self.buckets)]
+            bucket_labels = _labels(self.label_names, labels, 'le="+Inf"')
+            yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {series[-1]}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route, method and status", ["route", "method", "status"]))
+http_errors = registry.register(Counter(
+    "http_request_errors_total", "HTTP requests answered with a 5xx status", ["route", "method"]))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "Time spent handling HTTP requests", ["route", "method"]))
+http_response_size = registry.register(Histogram(
+    "http_response_size_bytes", "HTTP response body size", ["route"], buckets=SIZE_BUCKETS))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled"))
+mongo_latency = registry.register(Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command time attributed to the route that issued it", ["route", "command"]))
+mongo_failures = registry.register(Counter(
+    "mongodb_command_failures_total", "Failed MongoDB commands", ["route", "command"]))
+mongo_documents = registry.register(Counter(
+    "mongodb_documents_returned_total", "Documents returned or affected by MongoDB commands", ["route", "command"]))
+
+
+class RequestContext:
+    __slots__ = ("scope",)
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        # FastAPI records the matched route in the scope once routing has happened
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+# Set per request so MongoDB commands (run on Motor's executor threads with a copied context) can be attributed
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+
+def current_route() -> str:
+    context = current_request.get()
+    return context.route if context else "background"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status, size and in-flight counts per route template."""
+
+    def __init__(self, app, skip_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext(scope)
+        token = current_request.set(context)
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            current_request.reset(token)
+            route, method = context.route, scope["method"]
+            http_requests.inc(route, method, str(status))
+            http_latency.observe(elapsed, route, method)
+            http_response_size.observe(size, route)
+            if status >= 500:
+                http_errors.inc(route, method)
+
+
+def _documents_in_reply(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if isinstance(reply.get("n"), int):
+        return reply["n"]
+    if isinstance(reply.get("values"), list):
+        return len(reply["values"])
+    return 0
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """PyMongo command listener that attributes DB time and returned documents to routes."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        route = current_route()
+        mongo_latency.observe(event.duration_micros / 1_000_000, route, event.command_name)
+        documents = _documents_in_reply(event.reply)
+        if documents:
+            mongo_documents.inc(route, event.command_name, amount=documents)
+
+    def failed(self, event):
+        route = current_route()
+        mongo_latency.observe(event.duration_micros / 1_000_000, route, event.command_name)
+        mongo_failures.inc(route, event.command_name)
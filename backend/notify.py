@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import smtplib
+from collections import deque
+from datetime import datetime
+from email.message import EmailMessage
+from typing import List, Optional
+
+
+def build_message(sender: str, recipients: List[str], subject: str, body: str, reply_to: Optional[str] = None) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    if reply_to:
+        message["Reply-To"] = reply_to
+    message.set_content(body)
+    return message
+
+
+class SMTPMailer:
+    """Sends mail through an SMTP relay; the blocking smtplib session runs in a worker thread."""
+
+    def __init__(self, host: str, port: int = 587, username: Optional[str] = None, password: Optional[str] = None, starttls: bool = True, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _send(self, message: EmailMessage):
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(message)
+
+    async def send(self, message: EmailMessage):
+        await asyncio.to_thread(self._send, message)
+
+
+class OutboxMailer:
+    """Stand-in used when no SMTP relay is configured: keeps the latest messages in memory and logs them."""
+
+    def __init__(self, capacity: int = 100):
+        self.messages = deque(maxlen=capacity)
+
+    async def send(self, message: EmailMessage):
+        self.messages.append({
+            "to": message["To"],
+            "subject": message["Subject"],
+            "replyTo": message["Reply-To"],
+            "body": message.get_content(),
+            "sentAt": datetime.utcnow(),
+        })
+        logging.info(f"Outbox: {message['Subject']!r} to {message['To']}")
+
+
+def create_mailer(host: Optional[str], port: int = 587, username: Optional[str] = None, password: Optional[str] = None, starttls: bool = True):
+    if host:
+        return SMTPMailer(host, port, username=username, password=password, starttls=starttls)
+    return OutboxMailer()
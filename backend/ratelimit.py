@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis support is optional
+    aioredis = None
+
+
+def parse_rate(value: str) -> Tuple[int, float]:
+    """Parse "<requests>/<seconds>" into a bucket capacity and a refill rate in tokens per second."""
+    count, _, seconds = value.partition("/")
+    capacity, period = int(count), float(seconds or 60)
+    if capacity < 1 or period <= 0:
+        raise ValueError(f"Invalid rate limit {value!r}")
+    return capacity, capacity / period
+
+
+def content_fingerprint(scope: str, content: dict) -> str:
+    # Case and surrounding whitespace do not make a resubmission distinct
+    normalized = {key: value.strip().lower() if isinstance(value, str) else value for key, value in content.items()}
+    raw = json.dumps(normalized, sort_keys=True, default=str).encode()
+    return f"{scope}:{hashlib.sha256(raw).hexdigest()}"
+
+
+class MemoryRateLimitBackend:
+    """Token buckets and duplicate markers local to this process, bounded by least recent use."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._claims: "OrderedDict[str, float]" = OrderedDict()
+
+    async def take(self, key: str, capacity: int, refill_rate: float) -> float:
+        """Take one token; returns 0 when allowed, otherwise the seconds until a token is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / refill_rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def claim(self, key: str, ttl: float) -> float:
+        """Mark key as seen for ttl seconds; returns 0 when newly claimed, otherwise the seconds left on the claim."""
+        now = time.monotonic()
+        expires_at = self._claims.get(key)
+        if expires_at is not None and expires_at > now:
+            return expires_at - now
+        self._claims[key] = now + ttl
+        self._claims.move_to_end(key)
+        # Claims share one ttl, so the oldest entries expire first
+        while self._claims and (len(self._claims) > self.max_keys or next(iter(self._claims.values())) <= now):
+            self._claims.popitem(last=False)
+        return 0.0
+
+    async def release(self, key: str):
+        self._claims.pop(key, None)
+
+
+# Refill and take in one round trip so concurrent workers cannot spend the same token
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimitBackend:
+    """Token buckets and duplicate markers in a Redis-compatible server, shared by every worker and host."""
+
+    def __init__(self, url: str, key_prefix: str = "portfolio:ratelimit:"):
+        if aioredis is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+        self.key_prefix = key_prefix
+        self._redis = aioredis.from_url(url)
+        self._take = self._redis.register_script(TAKE_SCRIPT)
+
+    async def take(self, key: str, capacity: int, refill_rate: float) -> float:
+        return float(await self._take(keys=[self.key_prefix + key], args=[capacity, refill_rate, time.time()]))
+
+    async def claim(self, key: str, ttl: float) -> float:
+        full_key = self.key_prefix + key
+        if await self._redis.set(full_key, 1, px=int(ttl * 1000), nx=True):
+            return 0.0
+        remaining = await self._redis.pttl(full_key)
+        return max(remaining, 0) / 1000
+
+    async def release(self, key: str):
+        await self._redis.delete(self.key_prefix + key)
+
+
+def create_rate_limit_backend(name: str, redis_url: Optional[str] = None):
+    if name == "redis":
+        if aioredis is not None and redis_url:
+            return RedisRateLimitBackend(redis_url)
+        logging.warning("Redis rate limit backend unavailable, falling back to in-memory rate limits")
+    return MemoryRateLimitBackend()
+
+
+class WriteThrottle:
+    """Guards anonymous write routes before they touch the database.
+
+    Each request takes a token from a bucket for its client IP and, when given, its email address, and
+    a submission whose normalized content was already accepted within duplicate_window is rejected.
+    Rejections raise a 429 with Retry-After. If the backend is unreachable requests are let through.
+    """
+
+    def __init__(
+        self,
+        backend,
+        per_ip: Tuple[int, float],
+        per_email: Tuple[int, float],
+        duplicate_window: float = 600,
+        trust_proxy: bool = False,
+    ):
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.duplicate_window = duplicate_window
+        self.trust_proxy = trust_proxy
+
+    def client_ip(self, request: Request) -> str:
+        if self.trust_proxy:
+            # The reverse proxy sets X-Real-IP; clients can only prepend to X-Forwarded-For
+            real_ip = request.headers.get("x-real-ip")
+            if real_ip:
+                return real_ip.strip()
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[-1].strip()
+        return request.client.host if request.client else "unknown"
+
+    async def check(self, request: Request, scope: str, content: dict, email: Optional[str] = None) -> Optional[str]:
+        """Raise a 429 if the request is over its limits; returns the duplicate key to release if the write fails."""
+        try:
+            limits = [(f"{scope}:ip:{self.client_ip(request)}", self.per_ip)]
+            if email:
+                limits.append((f"{scope}:email:{email.strip().lower()}", self.per_email))
+            for key, (capacity, refill_rate) in limits:
+                wait = await self.backend.take(key, capacity, refill_rate)
+                if wait > 0:
+                    self._reject(wait, "Too many submissions, please try again later")
+
+            fingerprint = content_fingerprint(scope, content)
+            remaining = await self.backend.claim(fingerprint, self.duplicate_window)
+            if remaining > 0:
+                self._reject(remaining, "Duplicate submission")
+            return fingerprint
+        except HTTPException:
+            raise
+        except Exception as e:
+            logging.error(f"Error checking rate limits: {str(e)}")
+            return None
+
+    async def release(self, fingerprint: Optional[str]):
+        """Forget a duplicate marker so a write that failed can be retried straight away."""
+        if fingerprint is None:
+            return
+        try:
+            await self.backend.release(fingerprint)
+        except Exception as e:
+            logging.error(f"Error releasing duplicate submission marker: {str(e)}")
+
+    @staticmethod
+    def _reject(wait: float, detail: str):
+        raise HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(max(1, int(wait + 0.999)))})
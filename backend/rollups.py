@@ -0,0 +1,130 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+
+# Bucket documents in contact_rollups: {_id: "<granularity>:<start iso>", granularity, start, total, status: {<status>: n}}
+GRANULARITIES = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+
+def as_naive_utc(moment: datetime) -> datetime:
+    """MongoDB returns naive UTC datetimes, so aware inputs are converted before comparing or querying."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    # ISO weeks start on Monday
+    return day - timedelta(days=day.weekday())
+
+
+def bucket_id(granularity: str, start: datetime) -> str:
+    return f"{granularity}:{start.isoformat()}"
+
+
+def _bucket_increments(counts: Iterable[tuple]) -> Dict[str, dict]:
+    """Fold (timestamp, status, count) rows into every bucket granularity."""
+    buckets = defaultdict(lambda: {"total": 0, "status": defaultdict(int)})
+    for moment, status, count in counts:
+        for granularity in GRANULARITIES:
+            start = bucket_start(moment, granularity)
+            bucket = buckets[bucket_id(granularity, start)]
+            bucket.update(granularity=granularity, start=start)
+            bucket["total"] += count
+            bucket["status"][status] += count
+    return buckets
+
+
+async def apply_submissions(rollups, submissions: Iterable[dict]):
+    """Add a batch of stored submissions to their hour, day and week buckets in one round trip."""
+    buckets = _bucket_increments((submission["timestamp"], submission.get("status", "new"), 1) for submission in submissions)
+    operations = [
+        UpdateOne(
+            {"_id": _id},
+            {
+                "$inc": {"total": bucket["total"], **{f"status.{status}": count for status, count in bucket["status"].items()}},
+                "$setOnInsert": {"granularity": bucket["granularity"], "start": bucket["start"]},
+            },
+            upsert=True,
+        )
+        for _id, bucket in buckets.items()
+    ]
+    if operations:
+        await rollups.bulk_write(operations, ordered=False)
+
+
+async def backfill_rollups(submissions, rollups):
+    """Rebuild every bucket from the submissions collection; used to bootstrap and to reconcile drift."""
+    # Grouping by hour in MongoDB keeps the rows returned proportional to hours with activity, not submissions
+    pipeline = [{"$group": {
+        "_id": {"hour": {"$dateToString": {"format": "%Y-%m-%dT%H:00:00", "date": "$timestamp"}}, "status": "$status"},
+        "count": {"$sum": 1},
+    }}]
+    rows = []
+    async for row in submissions.aggregate(pipeline):
+        rows.append((datetime.fromisoformat(row["_id"]["hour"]), row["_id"]["status"] or "new", row["count"]))
+    buckets = _bucket_increments(rows)
+
+    operations = [
+        UpdateOne(
+            {"_id": _id},
+            {"$set": {
+                "granularity": bucket["granularity"],
+                "start": bucket["start"],
+                "total": bucket["total"],
+                "status": dict(bucket["status"]),
+            }},
+            upsert=True,
+        )
+        for _id, bucket in buckets.items()
+    ]
+    if operations:
+        await rollups.bulk_write(operations, ordered=False)
+    await rollups.delete_many({"_id": {"$nin": list(buckets)}})
+    return len(buckets)
+
+
+async def ensure_rollups(submissions, rollups):
+    """Backfill the buckets on first start against existing data."""
+    try:
+        if await rollups.estimated_document_count() == 0 and await submissions.estimated_document_count() > 0:
+            await backfill_rollups(submissions, rollups)
+    except Exception as e:
+        logging.error(f"Error bootstrapping contact rollups: {str(e)}")
+
+
+async def read_rollups(rollups, granularity: str, start: datetime, end: datetime, status: Optional[str] = None) -> List[dict]:
+    """Bucket counts from start (inclusive) to end (exclusive), with empty buckets filled in."""
+    start, end = as_naive_utc(start), as_naive_utc(end)
+    first = bucket_start(start, granularity)
+    found = {}
+    query = {"granularity": granularity, "start": {"$gte": first, "$lt": end}}
+    async for bucket in rollups.find(query).sort("start", 1):
+        found[bucket["start"]] = bucket
+
+    series = []
+    step = GRANULARITIES[granularity]
+    current = first
+    while current < end:
+        bucket = found.get(current, {})
+        by_status = bucket.get("status", {})
+        series.append({
+            "start": current,
+            "total": by_status.get(status, 0) if status else bucket.get("total", 0),
+            "byStatus": {status: by_status.get(status, 0)} if status else by_status,
+        })
+        current += step
+    return series
@@ -0,0 +1,154 @@
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+# Scripts written without spaces between words (kana, CJK ideographs, hangul) are indexed one
+# character at a time; everything else splits on Unicode word boundaries
+UNSPACED = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+TOKEN_PATTERN = re.compile(f"[{UNSPACED}]|[^\\W{UNSPACED}]+")
+
+# Field weights applied to term frequencies, so a hit in the title counts more than one in the body
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.5, "excerpt": 1.5, "content": 1.0}
+
+# Fields read from MongoDB when (re)building the index
+INDEX_PROJECTION = {
+    "title": 1, "excerpt": 1, "content": 1, "tags": 1,
+    "category": 1, "featured": 1, "published": 1, "date": 1,
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", text).casefold()) if text else []
+
+
+class BlogSearchIndex:
+    """In-process inverted index over blog posts with BM25 ranking and prefix matching."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, prefix_weight: float = 0.5, max_prefix_terms: int = 64):
+        self.k1 = k1
+        self.b = b
+        self.prefix_weight = prefix_weight
+        self.max_prefix_terms = max_prefix_terms
+        self.ready = False
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_lengths: Dict[str, float] = {}
+        self._doc_meta: Dict[str, dict] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    async def build(self, collection, batch_size: int = 500):
+        """Index every post in the collection; the index is marked ready once the scan completes."""
+        self.ready = False
+        cursor = collection.find({}, INDEX_PROJECTION).batch_size(batch_size)
+        async for post in cursor:
+            self.add(post)
+        self.ready = True
+
+    def add(self, post: dict):
+        doc_id = str(post["_id"])
+        self.remove(doc_id)
+
+        terms: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            value = post.get(field)
+            if isinstance(value, list):
+                value = " ".join(str(item) for item in value)
+            for token in tokenize(value or ""):
+                terms[token] = terms.get(token, 0.0) + weight
+
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            postings[doc_id] = frequency
+
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+        self._doc_meta[doc_id] = {
+            "category": post.get("category"),
+            "featured": post.get("featured", False),
+            "published": post.get("published", True),
+            "date": post.get("date") or datetime.min,
+        }
+
+    def remove(self, doc_id: str):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                index = bisect_left(self._vocabulary, term)
+                if index < len(self._vocabulary) and self._vocabulary[index] == term:
+                    del self._vocabulary[index]
+        self._total_length -= self._doc_lengths.pop(doc_id, 0.0)
+        self._doc_meta.pop(doc_id, None)
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Return the exact term plus vocabulary terms that start with the token."""
+        matches = []
+        if token in self._postings:
+            matches.append((token, 1.0))
+        if len(token) < 2:
+            return matches
+        index = bisect_left(self._vocabulary, token)
+        while index < len(self._vocabulary) and len(matches) < self.max_prefix_terms:
+            term = self._vocabulary[index]
+            if not term.startswith(token):
+                break
+            if term != token:
+                matches.append((term, self.prefix_weight))
+            index += 1
+        return matches
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        featured: Optional[bool] = None,
+        published: Optional[bool] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return (post id, score) pairs matching the query, best match first."""
+        doc_count = len(self._doc_lengths)
+        if not doc_count:
+            return []
+        average_length = (self._total_length / doc_count) or 1.0
+
+        scores: Dict[str, float] = {}
+        for token in set(tokenize(query)):
+            for term, boost in self._expand(token):
+                postings = self._postings[term]
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                    score = boost * idf * frequency * (self.k1 + 1) / (frequency + norm)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        results = []
+        for doc_id, score in scores.items():
+            meta = self._doc_meta[doc_id]
+            if category is not None and meta["category"] != category:
+                continue
+            if featured is not None and meta["featured"] != featured:
+                continue
+            if published is not None and meta["published"] != published:
+                continue
+            results.append((doc_id, score))
+
+        results.sort(key=lambda item: (item[1], self._doc_meta[item[0]]["date"]), reverse=True)
+        return results
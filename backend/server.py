@@ -1,5 +1,5 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -9,18 +9,206 @@ from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional
 import uuid
-from datetime import datetime
+import httpx
+import asyncio
+from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 import re
+import json
+import base64
+import csv
+import hmac
+import io
+
+from search_index import BlogSearchIndex, tokenize
+from indexes import ensure_indexes, index_report
+from cache import CachedResponse, ResponseCache, create_cache_backend
+from conditional import content_etag, version_etag, is_not_modified, validator_headers
+from fast_json import FastJSONResponse, encode_json, response_projection
+from ingest import ContactIngestQueue, IngestQueueFull
+from facets import apply_post, ensure_facets, read_facets, rebuild_facets
+from compression import CompressionMiddleware, Compressor
+from metrics import MetricsMiddleware, MongoCommandMetrics, registry as metrics_registry
+from slow_queries import SlowQueryWatchdog
+from database import client_options_from_env, public_read_preference, warmup_connection_count
+from invalidation import create_invalidation_bus
+from home import HomeSnapshot, Section
+from rollups import GRANULARITIES, apply_submissions, as_naive_utc, backfill_rollups, ensure_rollups, read_rollups
+from snapshot import SnapshotBuilder
+from bulk import InvalidImportBody, bulk_upsert, iter_json_array, iter_ndjson
+from singleflight import SingleFlight
+from jobs import JobQueue
+from notify import OutboxMailer, build_message, create_mailer
+from ratelimit import WriteThrottle, create_rate_limit_backend, parse_rate
+from counters import count_blog_post, count_contact_submissions, count_testimonial, ensure_counters, read_counters, reconcile_counters
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Flags MongoDB commands slower than the threshold and explains a sample of them
+slow_query_watchdog = SlowQueryWatchdog(
+    threshold_ms=float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '100')),
+    sample_rate=float(os.environ.get('SLOW_QUERY_SAMPLE_RATE', '1.0')),
+    capacity=int(os.environ.get('SLOW_QUERY_BUFFER_SIZE', '200')),
+    explain_cooldown=float(os.environ.get('SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS', '60')),
+)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+mongo_options = client_options_from_env()
+
+def mongo_client_factory():
+    return AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics(), slow_query_watchdog], **mongo_options)
+
+# Opened per worker in the startup hook; a client created before a fork is not safe to use in the child
+client = None
+db = None
+# Uncached anonymous reads may be served by secondaries; writes and admin reads stay on the primary.
+# Cached routes also load from the primary, since reloading from a lagging secondary right after
+# an invalidation would cache the stale result for a full TTL.
+read_db = None
+
+# Contact submissions are exported in cursor batches of this size
+CONTACT_EXPORT_BATCH_SIZE = int(os.environ.get('CONTACT_EXPORT_BATCH_SIZE', '500'))
+
+# Contact submissions are acknowledged once spooled and written to MongoDB in batches
+contact_ingest = ContactIngestQueue(
+    lambda: db.contact_submissions,
+    spool_path=Path(os.environ.get('CONTACT_SPOOL_PATH', ROOT_DIR / 'spool' / 'contact_submissions.jsonl')),
+    batch_size=int(os.environ.get('CONTACT_BATCH_SIZE', '100')),
+    flush_interval=int(os.environ.get('CONTACT_FLUSH_INTERVAL_MS', '200')) / 1000,
+    max_pending=int(os.environ.get('CONTACT_MAX_PENDING', '10000')),
+    on_written=lambda documents: record_contact_submissions(documents),
+    on_persisted=lambda documents: queue_contact_notifications(documents),
+)
+
+async def record_contact_submissions(documents):
+    # Counters and time buckets are updated once per flushed batch rather than once per submission
+    await count_contact_submissions(db.statistics_counters, documents)
+    await apply_submissions(db.contact_rollups, documents)
+
+async def queue_contact_notifications(documents):
+    # One insert per flushed batch, keyed by submission id, and only for submissions that are stored
+    await job_queue.enqueue_many("contact.notify", [(str(document["_id"]), document) for document in documents])
+
+# Side effects of writes (notifications, derived counts, reindexing, cache warming) run as persisted
+# background jobs so they never add to request latency
+job_queue = JobQueue(
+    lambda: db.jobs,
+    concurrency=int(os.environ.get('JOB_WORKERS', '4')),
+    max_attempts=int(os.environ.get('JOB_MAX_ATTEMPTS', '5')),
+    backoff=float(os.environ.get('JOB_RETRY_BACKOFF_SECONDS', '5')),
+    poll_interval=float(os.environ.get('JOB_POLL_INTERVAL_SECONDS', '5')),
+)
+
+# Without SMTP_HOST, notifications go to an in-memory outbox (GET /api/admin/outbox)
+mailer = create_mailer(
+    os.environ.get('SMTP_HOST'),
+    port=int(os.environ.get('SMTP_PORT', '587')),
+    username=os.environ.get('SMTP_USERNAME'),
+    password=os.environ.get('SMTP_PASSWORD'),
+    starttls=os.environ.get('SMTP_STARTTLS', 'true').lower() == 'true',
+)
+NOTIFY_EMAIL_FROM = os.environ.get('NOTIFY_EMAIL_FROM', 'portfolio@localhost')
+NOTIFY_EMAIL_TO = [address.strip() for address in os.environ.get('NOTIFY_EMAIL_TO', NOTIFY_EMAIL_FROM).split(',') if address.strip()]
+
+@job_queue.handler("contact.notify")
+async def notify_contact_submission(submission: dict):
+    # Header values may not span lines
+    subject = " ".join(submission["subject"].split())
+    body = f"From: {submission['name']} <{submission['email']}>\nReceived: {submission['timestamp']}\n\n{submission['message']}"
+    await mailer.send(build_message(NOTIFY_EMAIL_FROM, NOTIFY_EMAIL_TO, f"New contact form message: {subject}", body, reply_to=submission["email"]))
+
+async def apply_once(key: str, effect):
+    """Run effect() at most once per key, however often the job that calls it is retried."""
+    # Marked in job_effects before the effect runs and unmarked if it fails, so a crash in between can only
+    # undercount, which statistics reconciliation corrects
+    try:
+        await db.job_effects.insert_one({"_id": key, "appliedAt": datetime.utcnow()})
+    except DuplicateKeyError:
+        return
+    try:
+        await effect()
+    except Exception:
+        await db.job_effects.delete_one({"_id": key})
+        raise
+
+@job_queue.handler("blog-post.count")
+async def count_created_blog_post(payload: dict):
+    post = await db.blog_posts.find_one({"_id": ObjectId(payload["id"])})
+    if post is None:
+        return
+    await apply_once(f"facets:{payload['id']}", lambda: apply_post(db.blog_facets, post))
+    await apply_once(f"counters:{payload['id']}", lambda: count_blog_post(db.statistics_counters, post))
+    await response_cache.invalidate("blog-posts")
+    # Primes the cache of the process running the job, or the shared cache with CACHE_BACKEND=redis
+    try:
+        await get_featured_blog_posts(warmup_request("/api/blog-posts/featured"), fields="summary")
+        await get_blog_facets(warmup_request("/api/blog-posts/facets"))
+    except Exception as e:
+        logging.error(f"Error warming blog post cache: {str(e)}")
+
+@job_queue.handler("blog-post.index")
+async def index_created_blog_post(payload: dict):
+    # Adding a post to the search index replaces any earlier entry, so reruns are harmless
+    document = await db.blog_posts.find_one({"_id": ObjectId(payload["id"])})
+    if document is None:
+        return
+    search_index.add(document)
+    await invalidation_bus.publish("search", op="add", id=payload["id"])
+
+# In-process full-text index behind /api/blog-posts?search=
+search_index = BlogSearchIndex()
+
+# Concurrent requests for the same uncached blog post share one query
+blog_post_reads = SingleFlight()
+
+# Read-through cache for public GET routes, invalidated by the admin writes that change them
+response_cache = ResponseCache(
+    create_cache_backend(
+        os.environ.get('CACHE_BACKEND', 'memory'),
+        max_entries=int(os.environ.get('CACHE_MAX_ENTRIES', '1024')),
+        redis_url=os.environ.get('REDIS_URL'),
+    ),
+    ttl=int(os.environ.get('CACHE_TTL_SECONDS', '300')),
+    publish=lambda namespaces: invalidation_bus.publish("cache", namespaces=namespaces),
+)
+# Post reads already in flight when a post changes are not shared with later requests
+response_cache.listeners.append(lambda namespace: blog_post_reads.forget() if namespace == "blog-posts" else None)
+
+# Keeps per-worker caches and search indexes coherent when running several workers
+invalidation_bus = create_invalidation_bus(
+    os.environ.get('INVALIDATION_CHANNEL', 'local'),
+    lambda: db,
+    redis_url=os.environ.get('REDIS_URL'),
+)
+
+# Anonymous writes are throttled per client IP and email, and repeated submissions are rejected before any database work
+write_throttle = WriteThrottle(
+    create_rate_limit_backend(os.environ.get('RATE_LIMIT_BACKEND', 'memory'), redis_url=os.environ.get('REDIS_URL')),
+    per_ip=parse_rate(os.environ.get('RATE_LIMIT_PER_IP', '10/60')),
+    per_email=parse_rate(os.environ.get('RATE_LIMIT_PER_EMAIL', '3/300')),
+    duplicate_window=float(os.environ.get('DUPLICATE_SUBMISSION_WINDOW_SECONDS', '600')),
+    trust_proxy=os.environ.get('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true',
+)
+
+# Bulk imports and admin writes need "Authorization: Bearer <ADMIN_TOKEN>" and are refused while it is unset
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+async def require_admin(authorization: Optional[str] = Header(default=None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin writes are disabled until ADMIN_TOKEN is set")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+
+# Negotiated gzip/brotli/zstd; cached responses carry their compressed bodies so each is compressed once
+compressor = Compressor(
+    min_size=int(os.environ.get('COMPRESSION_MIN_SIZE', '1024')),
+    encodings=os.environ['COMPRESSION_ENCODINGS'].split(',') if os.environ.get('COMPRESSION_ENCODINGS') else None,
+)
 
 # Create the main app without a prefix
 app = FastAPI(title="Portfolio API", version="1.0.0")
@@ -28,15 +216,38 @@ app = FastAPI(title="Portfolio API", version="1.0.0")
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
-# Helper function to convert ObjectId to string
-def serialize_object_id(obj):
-    if isinstance(obj, ObjectId):
-        return str(obj)
-    if isinstance(obj, dict):
-        return {k: serialize_object_id(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [serialize_object_id(item) for item in obj]
-    return obj
+# Encode response data once so it can be cached and replayed without re-validation
+def encode_response(data, last_modified: Optional[datetime] = None) -> CachedResponse:
+    body = encode_json(data)
+    return CachedResponse(body=body, etag=content_etag(body), last_modified=last_modified, encodings=compressor.precompress(body))
+
+def latest(documents, field: str) -> Optional[datetime]:
+    return max((doc[field] for doc in documents if doc.get(field)), default=None)
+
+# Opaque pagination cursors: URL-safe base64 of a small JSON position
+def encode_cursor(position: dict) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+        if not isinstance(position, dict):
+            raise ValueError("cursor is not an object")
+        # Either a keyset position {d, i} or a ranked search offset {o}
+        if set(position) == {"d", "i"}:
+            if not ObjectId.is_valid(position["i"]):
+                raise ValueError("cursor id is not an ObjectId")
+            datetime.fromisoformat(position["d"])
+        elif set(position) == {"o"}:
+            if type(position["o"]) is not int or position["o"] < 0:
+                raise ValueError("cursor offset is not a non-negative integer")
+        else:
+            raise ValueError("unknown cursor shape")
+        return position
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 # Pydantic Models
 class ContactSubmission(BaseModel):
@@ -86,6 +297,20 @@ class BlogPostCreate(BaseModel):
     featured: bool = Field(default=False)
     published: bool = Field(default=True)
 
+class BlogPostSummary(BaseModel):
+    id: str
+    title: str
+    excerpt: str
+    date: datetime
+    readTime: str
+    category: str
+    tags: List[str]
+    author: str
+    featured: bool
+    published: bool
+    createdAt: datetime
+    updatedAt: datetime
+
 class BlogPostResponse(BaseModel):
     id: str
     title: str
@@ -163,6 +388,12 @@ class TestimonialResponse(BaseModel):
     createdAt: datetime
     updatedAt: datetime
 
+class HomeResponse(BaseModel):
+    featuredPosts: List[BlogPostSummary]
+    testimonials: List[TestimonialResponse]
+    statistics: Statistics
+    resume: Resume
+
 # API Routes
 @api_router.get("/")
 async def root():
@@ -170,92 +401,312 @@ async def root():
 
 # Contact Form Routes
 @api_router.post("/contact", response_model=ContactSubmissionResponse)
-async def submit_contact_form(contact_data: ContactSubmissionCreate):
+async def submit_contact_form(contact_data: ContactSubmissionCreate, request: Request):
+    duplicate_key = await write_throttle.check(request, "contact", contact_data.dict(), email=contact_data.email)
     try:
         # Create contact submission
         submission = ContactSubmission(**contact_data.dict())
         
-        # Insert into database
-        result = await db.contact_submissions.insert_one(submission.dict())
+        # Queue for a batched insert; the id is assigned up front
+        submission_id = contact_ingest.submit(submission.dict())
         
         # Return response
         response_data = submission.dict()
-        response_data["id"] = str(result.inserted_id)
+        response_data["id"] = str(submission_id)
         
         return ContactSubmissionResponse(**response_data)
     
+    except IngestQueueFull:
+        await write_throttle.release(duplicate_key)
+        raise HTTPException(status_code=503, detail="Contact form is busy, please try again shortly")
     except Exception as e:
+        await write_throttle.release(duplicate_key)
         logging.error(f"Error submitting contact form: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to submit contact form")
 
 @api_router.get("/contact", response_model=List[ContactSubmissionResponse])
-async def get_contact_submissions():
+async def get_contact_submissions(
+    status: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None
+):
     try:
-        submissions = await db.contact_submissions.find().sort("timestamp", -1).to_list(1000)
-        return [ContactSubmissionResponse(id=str(sub["_id"]), **{k: v for k, v in sub.items() if k != "_id"}) for sub in submissions]
+        position = decode_cursor(cursor) if cursor else None
+        query = {"status": status} if status else {}
+        if position and "d" in position:
+            # Keyset pagination on (timestamp, _id), same cursor format as blog posts
+            last_timestamp = datetime.fromisoformat(position["d"])
+            query["$or"] = [
+                {"timestamp": {"$lt": last_timestamp}},
+                {"timestamp": last_timestamp, "_id": {"$lt": ObjectId(position["i"])}}
+            ]
+        
+        pipeline = [{"$match": query}, {"$sort": {"timestamp": -1, "_id": -1}}]
+        if not position:
+            pipeline.append({"$skip": skip})
+        pipeline += [{"$limit": limit}, response_projection(ContactSubmissionResponse)]
+        submissions = await db.contact_submissions.aggregate(pipeline).to_list(limit)
+        
+        headers = {}
+        if len(submissions) == limit:
+            last = submissions[-1]
+            headers["X-Next-Cursor"] = encode_cursor({"d": last["timestamp"].isoformat(), "i": last["id"]})
+        return FastJSONResponse(submissions, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error fetching contact submissions: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch contact submissions")
 
+CONTACT_EXPORT_FIELDS = ["id", "name", "email", "subject", "message", "status", "timestamp"]
+
+# Default window per granularity when no start is given
+CONTACT_ANALYTICS_WINDOWS = {"hour": timedelta(hours=48), "day": timedelta(days=30), "week": timedelta(weeks=52)}
+CONTACT_ANALYTICS_MAX_BUCKETS = 10000
+
+@api_router.get("/contact/analytics")
+async def get_contact_analytics(
+    granularity: str = Query(default="day", pattern="^(hour|day|week)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: Optional[str] = None
+):
+    end = as_naive_utc(end) if end else datetime.utcnow()
+    start = as_naive_utc(start) if start else end - CONTACT_ANALYTICS_WINDOWS[granularity]
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if (end - start) / GRANULARITIES[granularity] > CONTACT_ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail="Range too large for this granularity")
+    try:
+        # Reads one pre-aggregated document per bucket, never the submissions themselves
+        buckets = await read_rollups(db.contact_rollups, granularity, start, end, status=status)
+        return FastJSONResponse({
+            "granularity": granularity,
+            "status": status,
+            "total": sum(bucket["total"] for bucket in buckets),
+            "buckets": buckets,
+        })
+    except Exception as e:
+        logging.error(f"Error fetching contact analytics: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch contact analytics")
+
+def contact_export_row(submission: dict) -> dict:
+    row = {field: submission.get(field) for field in CONTACT_EXPORT_FIELDS}
+    row["id"] = str(submission["_id"])
+    if isinstance(row["timestamp"], datetime):
+        row["timestamp"] = row["timestamp"].isoformat()
+    return row
+
+async def stream_contact_export(query: dict, export_format: str):
+    # Rows are written per cursor batch, so memory stays flat regardless of inbox size
+    submissions = db.contact_submissions.find(query, {field: 1 for field in CONTACT_EXPORT_FIELDS if field != "id"}).sort([("timestamp", -1), ("_id", -1)]).batch_size(CONTACT_EXPORT_BATCH_SIZE)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CONTACT_EXPORT_FIELDS)
+    if export_format == "csv":
+        writer.writeheader()
+    
+    pending = 0
+    async for submission in submissions:
+        row = contact_export_row(submission)
+        if export_format == "csv":
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False))
+            buffer.write("\n")
+        pending += 1
+        if pending >= CONTACT_EXPORT_BATCH_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+@api_router.get("/contact/export")
+async def export_contact_submissions(
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[str] = None
+):
+    query = {"status": status} if status else {}
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_contact_export(query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="contact_submissions.{format}"'},
+    )
+
+# Bulk imports accept NDJSON (streamed line by line) or a JSON array and upsert on each item's natural key
+BULK_IMPORT_BATCH_SIZE = int(os.environ.get('BULK_IMPORT_BATCH_SIZE', '1000'))
+
+def import_items(request: Request):
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return iter_ndjson(request.stream())
+
+    async def items():
+        async for item in iter_json_array(await request.body()):
+            yield item
+    return items()
+
+def upsert_update(document: dict, fields: dict) -> dict:
+    """$set the imported fields and updatedAt; everything else in the document only applies to new inserts."""
+    updated = {key: document[key] for key in fields}
+    updated["updatedAt"] = document["updatedAt"]
+    return {"$set": updated, "$setOnInsert": {key: value for key, value in document.items() if key not in updated}}
+
 # Blog Posts Routes
-@api_router.get("/blog-posts", response_model=List[BlogPostResponse])
+# List routes return summaries unless the caller asks for full content
+BLOG_POST_FIELDS = {"summary": BlogPostSummary, "full": BlogPostResponse}
+
+@api_router.get("/blog-posts", response_model=List[BlogPostSummary])
 async def get_blog_posts(
+    request: Request,
     category: Optional[str] = None,
     search: Optional[str] = None,
     featured: Optional[bool] = None,
     published: Optional[bool] = True,
-    limit: int = Query(default=10, le=100),
-    skip: int = Query(default=0, ge=0)
+    limit: int = Query(default=10, ge=1, le=100),
+    skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None,
+    fields: str = Query(default="summary", pattern="^(summary|full)$")
 ):
     try:
-        # Build query
-        query = {}
-        if category:
-            query["category"] = category
-        if search:
-            query["$or"] = [
-                {"title": {"$regex": search, "$options": "i"}},
-                {"excerpt": {"$regex": search, "$options": "i"}},
-                {"content": {"$regex": search, "$options": "i"}},
-                {"tags": {"$regex": search, "$options": "i"}}
-            ]
-        if featured is not None:
-            query["featured"] = featured
-        if published is not None:
-            query["published"] = published
-        
-        # Fetch posts
-        posts = await db.blog_posts.find(query).sort("date", -1).skip(skip).limit(limit).to_list(limit)
-        
-        return [BlogPostResponse(id=str(post["_id"]), **{k: v for k, v in post.items() if k != "_id"}) for post in posts]
-    
+        position = decode_cursor(cursor) if cursor else None
+        model = BLOG_POST_FIELDS[fields]
+
+        # Queries with no indexable terms (punctuation only) go to the regex path
+        if search and search_index.ready and tokenize(search):
+            # Rank matches in memory, then fetch only the requested page
+            if position and "o" not in position:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            ranked = search_index.search(search, category=category or None, featured=featured, published=published)
+            offset = position["o"] if position else skip
+            page_ids = [doc_id for doc_id, _ in ranked[offset:offset + limit]]
+            pipeline = [{"$match": {"_id": {"$in": [ObjectId(doc_id) for doc_id in page_ids]}}}, response_projection(model)]
+            found = await read_db.blog_posts.aggregate(pipeline).to_list(len(page_ids))
+            found_by_id = {post["id"]: post for post in found}
+            posts = [found_by_id[doc_id] for doc_id in page_ids if doc_id in found_by_id]
+            next_cursor = encode_cursor({"o": offset + limit}) if offset + limit < len(ranked) else None
+        else:
+            posts, next_cursor = await fetch_blog_post_page(model, category, search, featured, published, limit, skip, position)
+
+        # Validators come from document versions, so a 304 skips encoding the body
+        etag = version_etag(request.url.query, [(post["id"], post.get("updatedAt")) for post in posts])
+        last_modified = latest(posts, "updatedAt")
+        headers = validator_headers(etag, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        # Documents are already projected to the response shape, so skip model construction
+        return FastJSONResponse(posts, headers=headers)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error fetching blog posts: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch blog posts")
 
-@api_router.get("/blog-posts/featured", response_model=List[BlogPostResponse])
-async def get_featured_blog_posts():
+async def fetch_blog_post_page(model, category, search, featured, published, limit, skip, position):
+    # Build query
+    conditions = []
+    if category:
+        conditions.append({"category": category})
+    if search:
+        # Fallback while the search index is still building
+        pattern = re.escape(search)
+        conditions.append({"$or": [
+            {"title": {"$regex": pattern, "$options": "i"}},
+            {"excerpt": {"$regex": pattern, "$options": "i"}},
+            {"content": {"$regex": pattern, "$options": "i"}},
+            {"tags": {"$regex": pattern, "$options": "i"}}
+        ]})
+    if featured is not None:
+        conditions.append({"featured": featured})
+    if published is not None:
+        conditions.append({"published": published})
+    if position and "d" in position:
+        # Keyset pagination: resume strictly after the last (date, _id) seen
+        last_date = datetime.fromisoformat(position["d"])
+        last_id = ObjectId(position["i"])
+        conditions.append({"$or": [
+            {"date": {"$lt": last_date}},
+            {"date": last_date, "_id": {"$lt": last_id}}
+        ]})
+    query = {"$and": conditions} if conditions else {}
+    
+    # Fetch posts
+    pipeline = [{"$match": query}, {"$sort": {"date": -1, "_id": -1}}]
+    if position and "o" in position:
+        # A search cursor issued by the index, continued on the regex fallback
+        skip = position["o"]
+    if not position or "o" in position:
+        pipeline.append({"$skip": skip})
+    pipeline += [{"$limit": limit}, response_projection(model)]
+    posts = await read_db.blog_posts.aggregate(pipeline).to_list(limit)
+    
+    next_cursor = None
+    if len(posts) == limit:
+        last = posts[-1]
+        next_cursor = encode_cursor({"d": last["date"].isoformat(), "i": last["id"]})
+    return posts, next_cursor
+
+@api_router.get("/blog-posts/featured", response_model=List[BlogPostSummary])
+async def get_featured_blog_posts(request: Request, fields: str = Query(default="summary", pattern="^(summary|full)$")):
+    async def load():
+        pipeline = [
+            {"$match": {"featured": True, "published": True}},
+            {"$sort": {"date": -1}},
+            {"$limit": 10},
+            response_projection(BLOG_POST_FIELDS[fields]),
+        ]
+        posts = await db.blog_posts.aggregate(pipeline).to_list(10)
+        return encode_response(posts, last_modified=latest(posts, "updatedAt"))
+
     try:
-        posts = await db.blog_posts.find({"featured": True, "published": True}).sort("date", -1).to_list(10)
-        return [BlogPostResponse(id=str(post["_id"]), **{k: v for k, v in post.items() if k != "_id"}) for post in posts]
+        cached = await response_cache.get_or_load("blog-posts", request, load)
+        return cached.to_response(request)
     except Exception as e:
         logging.error(f"Error fetching featured blog posts: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch featured blog posts")
 
 @api_router.get("/blog-posts/categories")
-async def get_blog_categories():
+async def get_blog_categories(request: Request):
+    async def load():
+        facets = await read_facets(db.blog_facets)
+        return encode_response({"categories": sorted(facet["name"] for facet in facets["categories"])})
+
     try:
-        categories = await db.blog_posts.distinct("category", {"published": True})
-        return {"categories": categories}
+        cached = await response_cache.get_or_load("blog-posts", request, load)
+        return cached.to_response(request)
     except Exception as e:
         logging.error(f"Error fetching blog categories: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch blog categories")
 
+@api_router.get("/blog-posts/facets")
+async def get_blog_facets(request: Request):
+    async def load():
+        return encode_response(await read_facets(db.blog_facets))
+
+    try:
+        cached = await response_cache.get_or_load("blog-posts", request, load)
+        return cached.to_response(request)
+    except Exception as e:
+        logging.error(f"Error fetching blog facets: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch blog facets")
+
 @api_router.post("/blog-posts", response_model=BlogPostResponse)
 async def create_blog_post(blog_data: BlogPostCreate):
     try:
         blog_post = BlogPost(**blog_data.dict())
-        result = await db.blog_posts.insert_one(blog_post.dict())
+        document = blog_post.dict()
+        result = await db.blog_posts.insert_one(document)
+        await response_cache.invalidate("blog-posts")
+        # Search index, facets, counters and cache warming follow in the background
+        await job_queue.enqueue("blog-post.index", {"id": str(result.inserted_id)})
+        await job_queue.enqueue("blog-post.count", {"id": str(result.inserted_id)})
         
         response_data = blog_post.dict()
         response_data["id"] = str(result.inserted_id)
@@ -266,16 +717,46 @@ async def create_blog_post(blog_data: BlogPostCreate):
         logging.error(f"Error creating blog post: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to create blog post")
 
+@api_router.post("/blog-posts/bulk", dependencies=[Depends(require_admin)])
+async def import_blog_posts(request: Request, batch_size: int = Query(default=BULK_IMPORT_BATCH_SIZE, ge=1, le=10000)):
+    def prepare(item):
+        if not isinstance(item, dict):
+            raise ValueError("Expected a JSON object")
+        data = BlogPostCreate(**item)
+        # Posts are matched on title, so re-importing the same content updates it in place
+        return {"title": data.title}, upsert_update(BlogPost(**data.dict()).dict(), data.dict())
+
+    try:
+        summary = await bulk_upsert(db.blog_posts, import_items(request), prepare, batch_size=batch_size)
+        if summary["inserted"] or summary["updated"]:
+            await rebuild_facets(db.blog_posts, db.blog_facets)
+            await reconcile_counters(db, db.statistics_counters)
+            await response_cache.invalidate("blog-posts")
+            asyncio.create_task(build_search_index(db))
+            await invalidation_bus.publish("search", op="rebuild")
+        return FastJSONResponse(summary)
+    except InvalidImportBody as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Error importing blog posts: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to import blog posts")
+
 @api_router.get("/blog-posts/{post_id}", response_model=BlogPostResponse)
-async def get_blog_post(post_id: str):
+async def get_blog_post(post_id: str, request: Request, response: Response):
     try:
         if not ObjectId.is_valid(post_id):
             raise HTTPException(status_code=400, detail="Invalid post ID")
         
-        post = await db.blog_posts.find_one({"_id": ObjectId(post_id)})
+        post = await blog_post_reads.do(post_id, lambda: read_db.blog_posts.find_one({"_id": ObjectId(post_id)}))
         if not post:
             raise HTTPException(status_code=404, detail="Blog post not found")
         
+        etag = version_etag(post["_id"], post.get("updatedAt"))
+        headers = validator_headers(etag, post.get("updatedAt"))
+        if is_not_modified(request, etag, post.get("updatedAt")):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        
         return BlogPostResponse(id=str(post["_id"]), **{k: v for k, v in post.items() if k != "_id"})
     
     except HTTPException:
@@ -284,28 +765,47 @@ async def get_blog_post(post_id: str):
         logging.error(f"Error fetching blog post: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch blog post")
 
+# The resume and statistics collections each hold one document; a missing one is created under this _id
+DEFAULT_DOCUMENT_ID = "default"
+
+async def ensure_default_document(collection, default: dict) -> dict:
+    """Return the collection's document, creating it from default if there is none.
+
+    The upsert targets a fixed _id, so workers racing on an empty collection create exactly one document.
+    """
+    document = await collection.find_one({})
+    if document is None:
+        try:
+            await collection.update_one({"_id": DEFAULT_DOCUMENT_ID}, {"$setOnInsert": default}, upsert=True)
+        except DuplicateKeyError:
+            # A concurrent upsert inserted it first
+            pass
+        document = await collection.find_one({})
+    return document
+
 # Resume Routes
+def default_resume() -> Resume:
+    return Resume(
+        personalInfo=PersonalInfo(),
+        education=[
+            Education(
+                degree="B.Tech. in Information Technology",
+                institution="UNSIET Jaunpur",
+                year="2007-2011",
+                location="India"
+            )
+        ]
+    )
+
 @api_router.get("/resume", response_model=Resume)
-async def get_resume():
+async def get_resume(request: Request):
+    async def load():
+        resume = await ensure_default_document(db.resume, default_resume().dict())
+        return encode_response(Resume(**{k: v for k, v in resume.items() if k != "_id"}), last_modified=resume.get("lastUpdated"))
+
     try:
-        resume = await db.resume.find_one({})
-        if not resume:
-            # Create default resume if none exists
-            default_resume = Resume(
-                personalInfo=PersonalInfo(),
-                education=[
-                    Education(
-                        degree="B.Tech. in Information Technology",
-                        institution="UNSIET Jaunpur",
-                        year="2007-2011",
-                        location="India"
-                    )
-                ]
-            )
-            await db.resume.insert_one(default_resume.dict())
-            return default_resume
-        
-        return Resume(**{k: v for k, v in resume.items() if k != "_id"})
+        cached = await response_cache.get_or_load("resume", request, load)
+        return cached.to_response(request)
     
     except Exception as e:
         logging.error(f"Error fetching resume: {str(e)}")
@@ -317,6 +817,7 @@ async def update_resume(resume_data: Resume):
         resume_data.lastUpdated = datetime.utcnow()
         
         await db.resume.replace_one({}, resume_data.dict(), upsert=True)
+        await response_cache.invalidate("resume")
         return resume_data
     
     except Exception as e:
@@ -325,27 +826,35 @@ async def update_resume(resume_data: Resume):
 
 # Statistics Routes
 @api_router.get("/statistics", response_model=Statistics)
-async def get_statistics():
+async def get_statistics(request: Request):
+    async def load():
+        stats = await ensure_default_document(db.statistics, Statistics().dict())
+        return encode_response(Statistics(**{k: v for k, v in stats.items() if k != "_id"}), last_modified=stats.get("lastUpdated"))
+
     try:
-        stats = await db.statistics.find_one({})
-        if not stats:
-            # Create default statistics if none exist
-            default_stats = Statistics()
-            await db.statistics.insert_one(default_stats.dict())
-            return default_stats
-        
-        return Statistics(**{k: v for k, v in stats.items() if k != "_id"})
+        cached = await response_cache.get_or_load("statistics", request, load)
+        return cached.to_response(request)
     
     except Exception as e:
         logging.error(f"Error fetching statistics: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch statistics")
 
+@api_router.get("/statistics/dynamic")
+async def get_dynamic_statistics(days: int = Query(default=30, ge=1, le=366)):
+    try:
+        # Counter and facet documents only; no source collection is scanned
+        return FastJSONResponse(await read_counters(db.statistics_counters, db.blog_facets, db.contact_rollups, days=days))
+    except Exception as e:
+        logging.error(f"Error fetching dynamic statistics: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch dynamic statistics")
+
 @api_router.put("/statistics", response_model=Statistics)
 async def update_statistics(stats_data: Statistics):
     try:
         stats_data.lastUpdated = datetime.utcnow()
         
         await db.statistics.replace_one({}, stats_data.dict(), upsert=True)
+        await response_cache.invalidate("statistics")
         return stats_data
     
     except Exception as e:
@@ -354,24 +863,33 @@ async def update_statistics(stats_data: Statistics):
 
 # Testimonials Routes
 @api_router.get("/testimonials", response_model=List[TestimonialResponse])
-async def get_testimonials(approved: bool = True, featured: Optional[bool] = None):
-    try:
+async def get_testimonials(request: Request, approved: bool = True, featured: Optional[bool] = None):
+    async def load():
         query = {"approved": approved}
         if featured is not None:
             query["featured"] = featured
         
-        testimonials = await db.testimonials.find(query).sort("createdAt", -1).to_list(1000)
-        return [TestimonialResponse(id=str(test["_id"]), **{k: v for k, v in test.items() if k != "_id"}) for test in testimonials]
+        pipeline = [{"$match": query}, {"$sort": {"createdAt": -1}}, {"$limit": 1000}, response_projection(TestimonialResponse)]
+        testimonials = await db.testimonials.aggregate(pipeline).to_list(1000)
+        return encode_response(testimonials, last_modified=latest(testimonials, "updatedAt"))
+
+    try:
+        cached = await response_cache.get_or_load("testimonials", request, load)
+        return cached.to_response(request)
     
     except Exception as e:
         logging.error(f"Error fetching testimonials: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch testimonials")
 
 @api_router.post("/testimonials", response_model=TestimonialResponse)
-async def create_testimonial(testimonial_data: TestimonialCreate):
+async def create_testimonial(testimonial_data: TestimonialCreate, request: Request):
+    duplicate_key = await write_throttle.check(request, "testimonials", testimonial_data.dict())
     try:
         testimonial = Testimonial(**testimonial_data.dict())
-        result = await db.testimonials.insert_one(testimonial.dict())
+        document = testimonial.dict()
+        result = await db.testimonials.insert_one(document)
+        await count_testimonial(db.statistics_counters, document)
+        await response_cache.invalidate("testimonials")
         
         response_data = testimonial.dict()
         response_data["id"] = str(result.inserted_id)
@@ -379,9 +897,166 @@ async def create_testimonial(testimonial_data: TestimonialCreate):
         return TestimonialResponse(**response_data)
     
     except Exception as e:
+        await write_throttle.release(duplicate_key)
         logging.error(f"Error creating testimonial: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to create testimonial")
 
+@api_router.post("/testimonials/bulk", dependencies=[Depends(require_admin)])
+async def import_testimonials(request: Request, batch_size: int = Query(default=BULK_IMPORT_BATCH_SIZE, ge=1, le=10000)):
+    def prepare(item):
+        if not isinstance(item, dict):
+            raise ValueError("Expected a JSON object")
+        data = TestimonialCreate(**item)
+        return {"name": data.name, "company": data.company}, upsert_update(Testimonial(**data.dict()).dict(), data.dict())
+
+    try:
+        summary = await bulk_upsert(db.testimonials, import_items(request), prepare, batch_size=batch_size)
+        if summary["inserted"] or summary["updated"]:
+            await reconcile_counters(db, db.statistics_counters)
+            await response_cache.invalidate("testimonials")
+        return FastJSONResponse(summary)
+    except InvalidImportBody as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Error importing testimonials: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to import testimonials")
+
+# Admin Routes
+@api_router.get("/admin/indexes")
+async def get_index_report():
+    try:
+        return await index_report(db)
+    except Exception as e:
+        logging.error(f"Error building index report: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to build index report")
+
+@api_router.post("/admin/statistics/reconcile", dependencies=[Depends(require_admin)])
+async def reconcile_statistics():
+    try:
+        await reconcile_statistics_counters()
+        return FastJSONResponse(await read_counters(db.statistics_counters, db.blog_facets, db.contact_rollups))
+    except Exception as e:
+        logging.error(f"Error reconciling statistics: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to reconcile statistics")
+
+@api_router.post("/admin/contact/analytics/backfill", dependencies=[Depends(require_admin)])
+async def backfill_contact_analytics():
+    try:
+        buckets = await backfill_rollups(db.contact_submissions, db.contact_rollups)
+        return {"buckets": buckets}
+    except Exception as e:
+        logging.error(f"Error backfilling contact analytics: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to backfill contact analytics")
+
+# Static snapshot of the public API, written for a CDN or web server to serve without Python
+SNAPSHOT_DIR = Path(os.environ.get('SNAPSHOT_DIR', ROOT_DIR / 'snapshot'))
+SNAPSHOT_PAGE_SIZE = int(os.environ.get('SNAPSHOT_PAGE_SIZE', '10'))
+snapshot_lock = asyncio.Lock()
+
+@api_router.post("/admin/snapshot", dependencies=[Depends(require_admin)])
+async def build_snapshot(full: bool = False):
+    if snapshot_lock.locked():
+        raise HTTPException(status_code=409, detail="A snapshot build is already running")
+    async with snapshot_lock:
+        try:
+            # Render through the app itself so the files match the live responses byte for byte
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://snapshot", headers={"Accept-Encoding": "identity"}) as http:
+                return await SnapshotBuilder(http, SNAPSHOT_DIR, page_size=SNAPSHOT_PAGE_SIZE, full=full).build()
+        except Exception as e:
+            logging.error(f"Error building snapshot: {str(e)}")
+            raise HTTPException(status_code=500, detail="Failed to build snapshot")
+
+@api_router.get("/admin/jobs")
+async def get_job_summary():
+    try:
+        return FastJSONResponse(await job_queue.summary())
+    except Exception as e:
+        logging.error(f"Error fetching job summary: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch job summary")
+
+@api_router.get("/admin/outbox")
+async def get_outbox():
+    if not isinstance(mailer, OutboxMailer):
+        raise HTTPException(status_code=404, detail="Outbox is only kept when SMTP_HOST is not set")
+    return FastJSONResponse(list(reversed(mailer.messages)))
+
+@api_router.get("/admin/slow-queries")
+async def get_slow_queries():
+    return slow_query_watchdog.report()
+
+# Health Routes
+@api_router.get("/health/ready")
+async def readiness():
+    # Load balancers should only route traffic here once the pool and hot caches are warm
+    if not warmup_state["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming", "error": warmup_state["error"]})
+    return {"status": "ready", "warmedAt": warmup_state["warmedAt"]}
+
+# Home Routes
+HOME_TESTIMONIALS_LIMIT = int(os.environ.get('HOME_TESTIMONIALS_LIMIT', '20'))
+
+async def load_home_featured_posts():
+    pipeline = [
+        {"$match": {"featured": True, "published": True}},
+        {"$sort": {"date": -1}},
+        {"$limit": 10},
+        response_projection(BlogPostSummary),
+    ]
+    return await db.blog_posts.aggregate(pipeline).to_list(10)
+
+async def load_home_testimonials():
+    pipeline = [
+        {"$match": {"approved": True}},
+        {"$sort": {"createdAt": -1}},
+        {"$limit": HOME_TESTIMONIALS_LIMIT},
+        response_projection(TestimonialResponse),
+    ]
+    return await db.testimonials.aggregate(pipeline).to_list(HOME_TESTIMONIALS_LIMIT)
+
+async def load_home_statistics():
+    # Defaults are not written here; bootstrap_database creates the document
+    stats = await db.statistics.find_one({}, {"_id": 0})
+    return (Statistics(**stats) if stats else Statistics()).dict()
+
+async def load_home_resume():
+    resume = await db.resume.find_one({}, {"_id": 0})
+    return (Resume(**resume) if resume else default_resume()).dict()
+
+def encode_home(data: dict) -> CachedResponse:
+    modified = [
+        latest(data["featuredPosts"], "updatedAt"),
+        latest(data["testimonials"], "updatedAt"),
+        data["statistics"].get("lastUpdated"),
+        data["resume"].get("lastUpdated"),
+    ]
+    return encode_response(data, last_modified=max((value for value in modified if value), default=None))
+
+# Everything the homepage needs, kept in memory and refreshed per section when its collection changes
+home_snapshot = HomeSnapshot(
+    lambda: db,
+    {
+        "featuredPosts": Section("blog_posts", "blog-posts", load_home_featured_posts),
+        "testimonials": Section("testimonials", "testimonials", load_home_testimonials),
+        "statistics": Section("statistics", "statistics", load_home_statistics),
+        "resume": Section("resume", "resume", load_home_resume),
+    },
+    encode_home,
+    poll_interval=float(os.environ.get('HOME_POLL_INTERVAL_SECONDS', '30')),
+)
+response_cache.listeners.append(home_snapshot.mark_dirty)
+
+@api_router.get("/home", response_model=HomeResponse)
+async def get_home(request: Request):
+    try:
+        snapshot = await home_snapshot.get()
+    except Exception as e:
+        logging.error(f"Error fetching home snapshot: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch home page data")
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Home page data is still loading")
+    return snapshot.to_response(request)
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -391,8 +1066,18 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
+app.add_middleware(CompressionMiddleware, compressor=compressor)
+
+# Outermost middleware, so recorded latency covers the whole stack
+app.add_middleware(MetricsMiddleware)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -400,6 +1085,156 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def connect_db_client():
+    global client, db, read_db
+    client = mongo_client_factory()
+    db = client[os.environ['DB_NAME']]
+    read_db = client.get_database(os.environ['DB_NAME'], read_preference=public_read_preference())
+
+async def apply_cache_invalidation(event: dict):
+    await response_cache.invalidate(*event["namespaces"], broadcast=False)
+
+async def apply_search_invalidation(event: dict):
+    if event["op"] == "rebuild":
+        await build_search_index(db)
+        return
+    # Read from the primary so the worker indexes the write it was told about
+    post = await db.blog_posts.find_one({"_id": ObjectId(event["id"])})
+    if post:
+        search_index.add(post)
+    else:
+        search_index.remove(event["id"])
+
+invalidation_bus.subscribe("cache", apply_cache_invalidation)
+invalidation_bus.subscribe("search", apply_search_invalidation)
+
+@app.on_event("startup")
+async def start_invalidation_bus():
+    await invalidation_bus.start()
+
+warmup_state = {"ready": False, "warmedAt": None, "error": None}
+statistics_tasks = []
+
+def warmup_request(path: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+async def bootstrap_database():
+    """Create declared indexes, default documents and derived collections; each step logs its own failures."""
+    await ensure_indexes(db)
+    try:
+        await ensure_default_document(db.resume, default_resume().dict())
+        await ensure_default_document(db.statistics, Statistics().dict())
+    except Exception as e:
+        logging.error(f"Error creating default documents: {str(e)}")
+    # Writes that land first are corrected by the periodic statistics reconciliation
+    await ensure_facets(db.blog_posts, db.blog_facets)
+    await ensure_counters(db, db.statistics_counters)
+    await ensure_rollups(db.contact_submissions, db.contact_rollups)
+
+async def warm_up():
+    """Bootstrap the database, open pooled connections and prime the hot cached routes, retrying until MongoDB answers."""
+    delay = 0.5
+    bootstrapped = False
+    while True:
+        try:
+            # Concurrent pings force the pool to open that many connections
+            await asyncio.gather(*[db.command("ping") for _ in range(warmup_connection_count(mongo_options))])
+            if not bootstrapped:
+                # Only once MongoDB answers, so an unreachable server is not waited out once per collection;
+                # /api/health/ready reports warming until this is done
+                await bootstrap_database()
+                bootstrapped = True
+            await get_featured_blog_posts(warmup_request("/api/blog-posts/featured"), fields="summary")
+            await get_statistics(warmup_request("/api/statistics"))
+            await get_resume(warmup_request("/api/resume"))
+            warmup_state.update(ready=True, warmedAt=datetime.utcnow().isoformat(), error=None)
+            logger.info("Warm-up complete")
+            return
+        except Exception as e:
+            warmup_state["error"] = str(e)
+            logging.error(f"Error warming up: {str(e)}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+@app.on_event("startup")
+async def start_warm_up():
+    asyncio.create_task(warm_up())
+
+async def explain_command(database_name: str, command: dict) -> dict:
+    return await client[database_name].command({"explain": command, "verbosity": "executionStats"})
+
+@app.on_event("startup")
+async def start_slow_query_watchdog():
+    slow_query_watchdog.attach(asyncio.get_running_loop(), explain_command)
+
+async def reconcile_statistics_counters():
+    await reconcile_counters(db, db.statistics_counters)
+    await backfill_rollups(db.contact_submissions, db.contact_rollups)
+    await rebuild_facets(db.blog_posts, db.blog_facets)
+    await response_cache.invalidate("blog-posts")
+
+async def reconcile_statistics_periodically():
+    interval = float(os.environ.get('STATS_RECONCILE_INTERVAL_SECONDS', '3600'))
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reconcile_statistics_counters()
+            logger.info("Statistics counters reconciled")
+        except Exception as e:
+            logging.error(f"Error reconciling statistics: {str(e)}")
+
+@app.on_event("startup")
+async def start_statistics_reconciliation():
+    statistics_tasks.append(asyncio.create_task(reconcile_statistics_periodically()))
+
+@app.on_event("shutdown")
+async def stop_statistics_reconciliation():
+    for task in statistics_tasks:
+        task.cancel()
+    statistics_tasks.clear()
+
+async def build_search_index(source=None):
+    # Rebuilds after a write pass the primary so the new posts are seen
+    try:
+        await search_index.build((source if source is not None else read_db).blog_posts)
+        logger.info(f"Blog search index built with {len(search_index)} posts")
+    except Exception as e:
+        logging.error(f"Error building blog search index: {str(e)}")
+
+@app.on_event("startup")
+async def start_search_index():
+    # Build in the background; searches use the regex fallback until it is ready
+    asyncio.create_task(build_search_index())
+
+@app.on_event("startup")
+async def start_home_snapshot():
+    await home_snapshot.start()
+
+@app.on_event("startup")
+async def start_contact_ingest():
+    await contact_ingest.start()
+
+@app.on_event("startup")
+async def start_job_queue():
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_contact_ingest():
+    await contact_ingest.stop()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+
+@app.on_event("shutdown")
+async def stop_home_snapshot():
+    await home_snapshot.stop()
+
+@app.on_event("shutdown")
+async def stop_invalidation_bus():
+    await invalidation_bus.stop()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
@@ -0,0 +1,39 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into one in-flight load whose result they all share.
+
+    The load runs in its own task, so a caller that is cancelled (a client disconnecting) does not
+    cancel it for the others. Nothing is kept once the load finishes; caching is left to the caller.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, load: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(load())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(call)
+
+    def _finish(self, key: str, call: asyncio.Future):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception as retrieved when every caller has gone away
+        if not call.cancelled():
+            call.exception()
+
+    def forget(self, prefix: str = ""):
+        """Let the next call for matching keys start a fresh load, e.g. after a write made the running one stale."""
+        for key in [key for key in self._calls if key.startswith(prefix)]:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
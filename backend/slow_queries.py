@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+from pymongo import monitoring
+
+from metrics import Counter, current_route, registry
+
+
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct"}
+# Plan stages that mean the query is not fully served by an index
+PLAN_ISSUES = {"COLLSCAN": "collection scan", "SORT": "in-memory sort"}
+
+slow_commands = registry.register(Counter(
+    "mongodb_slow_commands_total", "MongoDB commands slower than the slow-query threshold", ["route", "command"]))
+docs_examined = registry.register(Counter(
+    "mongodb_documents_examined_total", "Documents examined by explained slow commands (sampled)", ["route", "command"]))
+
+
+def query_shape(value):
+    """Replace literal values with their type names so queries differing only in values group together."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = [query_shape(item) for item in value]
+        # Stages and $or branches keep their structure; lists of literals collapse to one entry
+        return shapes if any(isinstance(item, (dict, list)) for item in value) else shapes[:1]
+    return type(value).__name__
+
+
+def explainable_command(command: dict) -> dict:
+    # Session, cluster time and read preference fields cannot be sent inside explain
+    return {key: value for key, value in command.items() if not key.startswith("$") and key not in ("lsid", "txnNumber")}
+
+
+def _plan_stages(plan, found: set):
+    if isinstance(plan, dict):
+        stage = plan.get("stage")
+        if stage in PLAN_ISSUES:
+            found.add(stage)
+        for value in plan.values():
+            _plan_stages(value, found)
+    elif isinstance(plan, list):
+        for item in plan:
+            _plan_stages(item, found)
+
+
+def _find_key(document, key: str):
+    if isinstance(document, dict):
+        if key in document:
+            return document[key]
+        values = document.values()
+    elif isinstance(document, list):
+        values = document
+    else:
+        return None
+    for value in values:
+        found = _find_key(value, key)
+        if found is not None:
+            return found
+    return None
+
+
+def summarize_explain(explain: dict) -> dict:
+    """Extract plan issues and execution counters from find or aggregate explain output."""
+    stages = set()
+    _plan_stages(_find_key(explain, "winningPlan"), stages)
+    stats = _find_key(explain, "executionStats") or {}
+    return {
+        "planIssues": sorted(PLAN_ISSUES[stage] for stage in stages),
+        "docsExamined": stats.get("totalDocsExamined"),
+        "keysExamined": stats.get("totalKeysExamined"),
+        "nReturned": stats.get("nReturned"),
+        "executionTimeMillis": stats.get("executionTimeMillis"),
+    }
+
+
+class SlowQueryWatchdog(monitoring.CommandListener):
+    """Records MongoDB commands slower than a threshold and explains a sample of them in the background."""
+
+    def __init__(self, threshold_ms: float = 100, sample_rate: float = 1.0, capacity: int = 200, explain_cooldown: float = 60):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.explain_cooldown = explain_cooldown
+        self.records = deque(maxlen=capacity)
+        self._pending: Dict[tuple, tuple] = {}
+        self._last_explained: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._explain: Optional[Callable[[str, dict], Awaitable[dict]]] = None
+
+    def attach(self, loop: asyncio.AbstractEventLoop, explain: Callable[[str, dict], Awaitable[dict]]):
+        self._loop = loop
+        self._explain = explain
+
+    def started(self, event):
+        if event.command_name in EXPLAINABLE_COMMANDS:
+            with self._lock:
+                self._pending[(event.connection_id, event.request_id)] = (event.command, event.database_name)
+
+    def succeeded(self, event):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None or event.duration_micros < self.threshold_ms * 1000:
+            return
+
+        command, database_name = pending
+        route = current_route()
+        slow_commands.inc(route, event.command_name)
+        shape = query_shape({key: value for key, value in explainable_command(command).items()
+                             if key in ("filter", "sort", "pipeline", "query", "key")})
+        record = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "route": route,
+            "command": event.command_name,
+            "collection": command.get(event.command_name),
+            "durationMs": round(event.duration_micros / 1000, 3),
+            "shape": shape,
+            "explain": None,
+        }
+        self.records.append(record)
+
+        if self._should_explain(f"{record['collection']}:{event.command_name}:{shape}"):
+            self._loop.call_soon_threadsafe(
+                asyncio.ensure_future,
+                self._run_explain(record, database_name, explainable_command(command)),
+            )
+
+    def failed(self, event):
+        with self._lock:
+            self._pending.pop((event.connection_id, event.request_id), None)
+
+    def _should_explain(self, shape_key: str) -> bool:
+        if self._loop is None or self._explain is None or random.random() >= self.sample_rate:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_explained.get(shape_key, float("-inf")) < self.explain_cooldown:
+                return False
+            self._last_explained[shape_key] = now
+        return True
+
+    async def _run_explain(self, record: dict, database_name: str, command: dict):
+        try:
+            summary = summarize_explain(await self._explain(database_name, command))
+            record["explain"] = summary
+            if summary["docsExamined"]:
+                docs_examined.inc(record["route"], record["command"], amount=summary["docsExamined"])
+        except Exception as e:
+            logging.error(f"Error explaining slow query: {str(e)}")
+
+    def report(self) -> dict:
+        return {
+            "thresholdMs": self.threshold_ms,
+            "sampleRate": self.sample_rate,
+            "queries": list(reversed(self.records)),
+        }
@@ -0,0 +1,203 @@
+"""Render the public API into pre-compressed static JSON files that a CDN or web server can serve directly.
+
+Usage (from backend/): python snapshot.py --output snapshot [--page-size 10] [--full]
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # Brotli output is optional
+    brotli = None
+
+
+MANIFEST = "manifest.json"
+
+# Single-document and unpaginated public routes, by output file
+STATIC_ROUTES = {
+    "api/home.json": "/api/home",
+    "api/resume.json": "/api/resume",
+    "api/statistics.json": "/api/statistics",
+    "api/testimonials.json": "/api/testimonials",
+    "api/testimonials/featured.json": "/api/testimonials?featured=true",
+    "api/blog-posts/featured.json": "/api/blog-posts/featured",
+    "api/blog-posts/categories.json": "/api/blog-posts/categories",
+    "api/blog-posts/facets.json": "/api/blog-posts/facets",
+}
+
+
+def slugify(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "uncategorized"
+
+
+def category_slugs(names) -> Dict[str, str]:
+    """Map each category to a unique slug; names sharing a slug (C, C++, C#) all get a suffix from their hash."""
+    by_slug: Dict[str, list] = {}
+    for name in names:
+        by_slug.setdefault(slugify(name), []).append(name)
+    slugs = {}
+    for slug, group in by_slug.items():
+        for name in group:
+            slugs[name] = slug if len(group) == 1 else f"{slug}-{hashlib.sha1(name.encode()).hexdigest()[:8]}"
+    return slugs
+
+
+class SnapshotBuilder:
+    """Renders public routes through the app over an HTTP client and writes changed files only.
+
+    Every file is written with .gz and (when the brotli package is installed) .br siblings. Files whose
+    content hash matches the previous manifest are left alone, and a post's detail page is only
+    re-rendered when the updatedAt seen on the list pages differs from the manifest.
+    """
+
+    def __init__(self, http, output_dir: Path, page_size: int = 10, full: bool = False):
+        self.http = http
+        self.output_dir = Path(output_dir)
+        self.page_size = page_size
+        self.full = full
+        self.previous: Dict[str, dict] = {}
+        self.files: Dict[str, dict] = {}
+        self.stats = {"written": 0, "unchanged": 0, "removed": 0}
+
+    def _load_manifest(self) -> dict:
+        path = self.output_dir / MANIFEST
+        if self.full or not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text())
+        except ValueError:
+            logging.error("Ignoring unreadable snapshot manifest")
+            return {}
+
+    async def build(self) -> dict:
+        previous = self._load_manifest()
+        # A different page size changes every page boundary
+        self.previous = previous.get("files", {}) if previous.get("pageSize") == self.page_size else {}
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        for relative_path, url in STATIC_ROUTES.items():
+            await self._render(relative_path, url)
+
+        posts = {}
+        pages = await self._render_pages("api/blog-posts/page", {}, posts)
+        categories = {}
+        slugs = category_slugs((await self._get_json("/api/blog-posts/categories"))["categories"])
+        for name, slug in slugs.items():
+            categories[slug] = {
+                "name": name,
+                "pages": await self._render_pages(f"api/blog-posts/category/{slug}/page", {"category": name}, posts),
+            }
+
+        for post_id, version in posts.items():
+            relative_path = f"api/blog-posts/{post_id}.json"
+            known = self.previous.get(relative_path)
+            if known and known.get("version") == version and (self.output_dir / relative_path).exists():
+                self.files[relative_path] = known
+                self.stats["unchanged"] += 1
+                continue
+            await self._render(relative_path, f"/api/blog-posts/{post_id}", version=version)
+
+        self._remove_stale()
+        manifest = {
+            "generatedAt": datetime.utcnow().isoformat(),
+            "pageSize": self.page_size,
+            "pages": pages,
+            "categories": categories,
+            "files": self.files,
+        }
+        self._write_file(MANIFEST, json.dumps(manifest, indent=2, sort_keys=True).encode())
+        return {**self.stats, "files": len(self.files)}
+
+    async def _render_pages(self, prefix: str, params: dict, posts: dict) -> int:
+        # Follows X-Next-Cursor, so each page is an index seek rather than a growing skip
+        page = 1
+        query = {**params, "limit": self.page_size}
+        while True:
+            response = await self.http.get("/api/blog-posts", params=query)
+            response.raise_for_status()
+            items = response.json()
+            if not items and page > 1:
+                return page - 1
+            for item in items:
+                posts[item["id"]] = item.get("updatedAt")
+            self._store(f"{prefix}/{page}.json", response.request.url.raw_path.decode(), response.content)
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                return page
+            query = {**params, "limit": self.page_size, "cursor": next_cursor}
+            page += 1
+
+    async def _get_json(self, url: str):
+        response = await self.http.get(url)
+        response.raise_for_status()
+        return response.json()
+
+    async def _render(self, relative_path: str, url: str, version: Optional[str] = None):
+        response = await self.http.get(url)
+        response.raise_for_status()
+        self._store(relative_path, url, response.content, version=version)
+
+    def _store(self, relative_path: str, source: str, body: bytes, version: Optional[str] = None):
+        digest = hashlib.sha256(body).hexdigest()
+        known = self.previous.get(relative_path)
+        if known and known["sha256"] == digest and (self.output_dir / relative_path).exists():
+            self.files[relative_path] = {**known, "version": version} if version else known
+            self.stats["unchanged"] += 1
+            return
+
+        entry = {"source": source, "sha256": digest, "bytes": len(body)}
+        entry["gzip"] = self._write_file(relative_path + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            entry["br"] = self._write_file(relative_path + ".br", brotli.compress(body, quality=11))
+        self._write_file(relative_path, body)
+        if version:
+            entry["version"] = version
+        self.files[relative_path] = entry
+        self.stats["written"] += 1
+
+    def _write_file(self, relative_path: str, data: bytes) -> int:
+        path = self.output_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Replace atomically so a server reading the directory never sees a partial file
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+        return len(data)
+
+    def _remove_stale(self):
+        for relative_path in set(self.previous) - set(self.files):
+            for suffix in ("", ".gz", ".br"):
+                path = self.output_dir / (relative_path + suffix)
+                if path.exists():
+                    path.unlink()
+            self.stats["removed"] += 1
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Render the public portfolio API into static files")
+    parser.add_argument("--output", type=Path, default=Path(os.environ.get("SNAPSHOT_DIR", Path(__file__).parent / "snapshot")))
+    parser.add_argument("--page-size", type=int, default=int(os.environ.get("SNAPSHOT_PAGE_SIZE", "10")))
+    parser.add_argument("--full", action="store_true", help="Ignore the previous manifest and rewrite every file")
+    options = parser.parse_args()
+
+    import httpx
+    import server
+
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://snapshot", headers={"Accept-Encoding": "identity"}) as http:
+            result = await SnapshotBuilder(http, options.output, page_size=options.page_size, full=options.full).build()
+    print(f"Snapshot written to {options.output}: {result}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Backend API Benchmark Suite for Dewanshu's Portfolio Website
+Boots server.app in-process against a local MongoDB stand-in, seeds data and drives
+concurrent load per route, then compares latency and throughput with a stored baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+from backend_test import PortfolioAPITester
+
+BACKEND_DIR = Path(__file__).parent / "backend"
+# The only database the benchmark writes to; seeding clears its collections
+BENCHMARK_DB_NAME = "portfolio_benchmark"
+
+CATEGORIES = ["AI & Machine Learning", "Leadership", "Architecture", "DevOps", "Career"]
+TAGS = ["AI", "Python", "Scalability", "Team Leadership", "Cloud", "MongoDB", "React", "Mentoring"]
+WORDS = ("engineering leadership scalable systems architecture teams delivery mentoring cloud "
+         "performance reliability product strategy machine learning data pipelines").split()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+class PortfolioAPIBenchmark(PortfolioAPITester):
+    def __init__(self, options):
+        super().__init__()
+        self.options = options
+        self.base_url = "in-process"
+        self.rng = random.Random(options.seed)
+        self.report = {}
+
+    def load_server(self):
+        """Import server.py with its database client factory pointed at the local stand-in"""
+        # Assigned rather than defaulted, so a shell pointing at a real database cannot redirect the run to it
+        os.environ["MONGO_URL"] = self.options.mongo_url or "mongodb://localhost:27017"
+        os.environ["DB_NAME"] = BENCHMARK_DB_NAME
+        os.environ["CONTACT_SPOOL_PATH"] = str(Path(tempfile.mkdtemp()) / "contact_submissions.jsonl")
+        # Every benchmark request comes from one client address, so per-IP write limits would reject most of them
+        os.environ["RATE_LIMIT_PER_IP"] = "1000000/1"
+        sys.path.insert(0, str(BACKEND_DIR))
+        import server
+
+        if not self.options.mongo_url:
+            try:
+                from mongomock_motor import AsyncMongoMockClient
+            except ImportError:
+                raise SystemExit("mongomock-motor is required unless --mongo-url points at a local mongod")
+            stand_in = AsyncMongoMockClient()
+            server.mongo_client_factory = lambda: stand_in
+        return server
+
+    async def seed(self, db):
+        """Insert generated posts, submissions and testimonials in batches"""
+        if db.name != BENCHMARK_DB_NAME:
+            raise SystemExit(f"Refusing to clear database {db.name!r}; the benchmark only seeds {BENCHMARK_DB_NAME!r}")
+        now = datetime.utcnow()
+        await db.blog_posts.delete_many({})
+        await db.contact_submissions.delete_many({})
+        await db.testimonials.delete_many({})
+
+        batch = []
+        for i in range(self.options.posts):
+            created = now - timedelta(minutes=i)
+            batch.append({
+                "title": f"{sentence(self.rng, 5).title()} {i}",
+                "excerpt": sentence(self.rng, 25),
+                "content": sentence(self.rng, self.options.content_words),
+                "date": created,
+                "readTime": f"{self.rng.randint(3, 15)} min read",
+                "category": self.rng.choice(CATEGORIES),
+                "tags": self.rng.sample(TAGS, 3),
+                "author": "Dewanshu Singh Sisaudiya",
+                "featured": i % 20 == 0,
+                "published": i % 10 != 0,
+                "createdAt": created,
+                "updatedAt": created,
+            })
+            if len(batch) >= 1000:
+                await db.blog_posts.insert_many(batch)
+                batch = []
+        if batch:
+            await db.blog_posts.insert_many(batch)
+
+        for collection, count, factory in (
+            (db.contact_submissions, self.options.submissions, self._submission),
+            (db.testimonials, self.options.testimonials, self._testimonial),
+        ):
+            batch = []
+            for i in range(count):
+                batch.append(factory(i, now))
+                if len(batch) >= 1000:
+                    await collection.insert_many(batch)
+                    batch = []
+            if batch:
+                await collection.insert_many(batch)
+
+    def _submission(self, i: int, now: datetime) -> dict:
+        return {
+            "name": f"Visitor {i}",
+            "email": f"visitor{i}@example.com",
+            "subject": sentence(self.rng, 4),
+            "message": sentence(self.rng, 60),
+            "status": self.rng.choice(["new", "read", "responded"]),
+            "timestamp": now - timedelta(minutes=i),
+        }
+
+    def _testimonial(self, i: int, now: datetime) -> dict:
+        created = now - timedelta(hours=i)
+        return {
+            "name": f"Colleague {i}",
+            "position": "Engineering Manager",
+            "company": f"Company {i % 50}",
+            "content": sentence(self.rng, 40),
+            "rating": self.rng.randint(3, 5),
+            "image": "",
+            "approved": i % 3 != 0,
+            "featured": i % 7 == 0,
+            "createdAt": created,
+            "updatedAt": created,
+        }
+
+    def routes(self) -> Dict[str, dict]:
+        return {
+            "GET /api/blog-posts": {"method": "GET", "path": "/api/blog-posts"},
+            "GET /api/blog-posts?limit=100": {"method": "GET", "path": "/api/blog-posts", "params": {"limit": 100}},
+            "GET /api/blog-posts?search=": {"method": "GET", "path": "/api/blog-posts", "params": lambda: {"search": self.rng.choice(WORDS)}},
+            "GET /api/blog-posts?skip=deep": {"method": "GET", "path": "/api/blog-posts", "params": {"skip": max(0, self.options.posts - 20)}},
+            "GET /api/blog-posts/featured": {"method": "GET", "path": "/api/blog-posts/featured"},
+            "GET /api/blog-posts/categories": {"method": "GET", "path": "/api/blog-posts/categories"},
+            "GET /api/testimonials": {"method": "GET", "path": "/api/testimonials"},
+            "GET /api/statistics": {"method": "GET", "path": "/api/statistics"},
+            "GET /api/resume": {"method": "GET", "path": "/api/resume"},
+            "GET /api/contact": {"method": "GET", "path": "/api/contact"},
+            "POST /api/contact": {"method": "POST", "path": "/api/contact", "json": lambda: {
+                "name": "Load Test",
+                "email": f"load{self.rng.randint(0, 10**9)}@example.com",
+                "subject": "Benchmark",
+                "message": sentence(self.rng, 30),
+            }},
+        }
+
+    def request_args(self, route: dict) -> dict:
+        params = route.get("params")
+        body = route.get("json")
+        return {
+            "params": params() if callable(params) else params,
+            "json": body() if callable(body) else body,
+        }
+
+    async def drive(self, http, name: str, route: dict) -> dict:
+        """Send route requests from concurrent workers and collect per-request latency"""
+        remaining = self.options.requests
+        latencies: List[float] = []
+        errors = 0
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                args = self.request_args(route)
+                start = time.perf_counter()
+                response = await http.request(route["method"], route["path"], **args)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.options.concurrency)))
+        elapsed = time.perf_counter() - started
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+        }
+
+    async def run(self):
+        import httpx
+
+        server = self.load_server()
+        print(f"🌱 Seeding {self.options.posts} posts, {self.options.submissions} submissions, {self.options.testimonials} testimonials")
+        seed_client = server.mongo_client_factory()
+        await self.seed(seed_client[os.environ["DB_NAME"]])
+
+        async with server.app.router.lifespan_context(server.app):
+            while not server.search_index.ready:
+                await asyncio.sleep(0.05)
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as http:
+                selected = self.routes()
+                if self.options.routes:
+                    selected = {name: route for name, route in selected.items() if any(f in name for f in self.options.routes)}
+                results = {}
+                for name, route in selected.items():
+                    # One warm-up pass so every route is measured with caches in steady state
+                    await http.request(route["method"], route["path"], **self.request_args(route))
+                    results[name] = await self.drive(http, name, route)
+                    print(f"⏱  {name}: p50={results[name]['p50_ms']}ms p95={results[name]['p95_ms']}ms rps={results[name]['rps']}")
+
+        self.report = {
+            "generatedAt": datetime.utcnow().isoformat(),
+            "dataset": {
+                "posts": self.options.posts,
+                "submissions": self.options.submissions,
+                "testimonials": self.options.testimonials,
+            },
+            "concurrency": self.options.concurrency,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "routes": results,
+        }
+        return self.report
+
+    def compare(self, baseline: dict) -> bool:
+        """Fail routes whose p95 latency grew or throughput dropped beyond the tolerance"""
+        tolerance = self.options.tolerance
+        for name, current in self.report["routes"].items():
+            previous = baseline.get("routes", {}).get(name)
+            if not previous:
+                self.log_test(f"{name} (no baseline)", True, "Recorded for the first time")
+                continue
+            slower = current["p95_ms"] > previous["p95_ms"] * (1 + tolerance)
+            fewer = current["rps"] < previous["rps"] * (1 - tolerance)
+            details = f"p95 {previous['p95_ms']} -> {current['p95_ms']}ms, rps {previous['rps']} -> {current['rps']}"
+            self.log_test(name, not (slower or fewer or current["errors"]), details)
+        return all(result["success"] for result in self.test_results)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the portfolio API in-process")
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--submissions", type=int, default=1000)
+    parser.add_argument("--testimonials", type=int, default=200)
+    parser.add_argument("--content-words", type=int, default=800, help="Words per generated post body")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--route", dest="routes", action="append", help="Only run routes containing this text")
+    parser.add_argument("--mongo-url", help="Use a local mongod instead of the in-memory stand-in")
+    # Latency depends on the machine, so each environment keeps its own baseline outside the repository
+    parser.add_argument("--baseline", type=Path, required=True, help="Baseline JSON to compare with; written on the first run")
+    parser.add_argument("--output", type=Path, help="Write this run's report to a JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--seed", type=int, default=1234)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    options = parse_args()
+    benchmark = PortfolioAPIBenchmark(options)
+    report = asyncio.run(benchmark.run())
+    print(f"📈 Peak RSS: {report['peak_rss_mb']} MB")
+
+    if options.output:
+        options.output.write_text(json.dumps(report, indent=2))
+
+    if options.update_baseline or not options.baseline.exists():
+        options.baseline.write_text(json.dumps(report, indent=2))
+        print(f"💾 Baseline written to {options.baseline}")
+        sys.exit(0)
+
+    success = benchmark.compare(json.loads(options.baseline.read_text()))
+    sys.exit(0 if success else 1)
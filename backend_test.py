@@ -6,6 +6,7 @@ Tests all backend endpoints with realistic data
 
 import requests
 import json
+import os
 import sys
 from datetime import datetime
 from typing import Dict, Any, List
@@ -13,6 +14,8 @@ import time
 
 # Backend URL from frontend/.env
 BASE_URL = "https://87c8a81b-687b-49fb-86f8-6bff799dbe2e.preview.emergentagent.com/api"
+# Bulk imports and admin writes need the server's ADMIN_TOKEN
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
 
 class PortfolioAPITester:
     def __init__(self):
@@ -62,10 +65,12 @@ class PortfolioAPITester:
         print("\n=== Testing Contact Form API ===")
         
         # Test POST /api/contact with valid data
+        # Unique per run, so reruns are not rejected as duplicates or by the per-email limit
+        run = int(time.time())
         contact_data = {
             "name": "Rajesh Kumar",
-            "email": "rajesh.kumar@techcorp.com",
-            "subject": "Collaboration Opportunity",
+            "email": f"rajesh.kumar.{run}@techcorp.com",
+            "subject": f"Collaboration Opportunity {run}",
             "message": "Hi Dewanshu, I came across your portfolio and I'm impressed with your work in AI and software engineering. I'd like to discuss a potential collaboration opportunity for our upcoming project. Would you be available for a brief call next week?"
         }
         
@@ -104,6 +109,23 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("POST /api/contact (invalid email)", False, f"Exception: {str(e)}")
         
+        # A second submission, so the cursor checks below have a page 2 to follow
+        second_contact_data = {
+            "name": "Ananya Rao",
+            "email": f"ananya.{int(time.time())}@example.com",
+            "subject": "Speaking Invitation",
+            "message": "Hello Dewanshu, we would love to have you speak about engineering leadership at our meetup next month."
+        }
+        second_response = self.session.post(f"{self.base_url}/contact", json=second_contact_data)
+        
+        # Submissions are written in batches shortly after they are accepted
+        submitted = {contact_id, second_response.json().get('id') if second_response.status_code == 200 else None}
+        for _ in range(10):
+            response = self.session.get(f"{self.base_url}/contact")
+            if response.status_code == 200 and submitted <= {submission['id'] for submission in response.json()}:
+                break
+            time.sleep(1)
+        
         # Test GET /api/contact
         try:
             response = self.session.get(f"{self.base_url}/contact")
@@ -118,6 +140,74 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("GET /api/contact", False, f"Exception: {str(e)}")
         
+        # Test GET /api/contact cursor pagination
+        try:
+            # Following the cursor from a one-item page must continue exactly where a two-item page would
+            expected = [item['id'] for item in self.session.get(f"{self.base_url}/contact?limit=2").json()]
+            response = self.session.get(f"{self.base_url}/contact?limit=1")
+            next_cursor = response.headers.get('X-Next-Cursor')
+            if response.status_code != 200:
+                self.log_test("GET /api/contact (cursor)", False, f"Status: {response.status_code}")
+            elif not next_cursor:
+                self.log_test("GET /api/contact (cursor)", False, "Missing X-Next-Cursor header")
+            else:
+                page_2 = self.session.get(f"{self.base_url}/contact", params={"limit": 1, "cursor": next_cursor})
+                pages = [item['id'] for item in response.json() + page_2.json()] if page_2.status_code == 200 else None
+                if len(expected) == 2 and pages == expected:
+                    self.log_test("GET /api/contact (cursor)", True, f"Pages 1 and 2: {pages}")
+                else:
+                    self.log_test("GET /api/contact (cursor)", False, f"Expected {expected}, got {pages} (page 2 status: {page_2.status_code})")
+        except Exception as e:
+            self.log_test("GET /api/contact (cursor)", False, f"Exception: {str(e)}")
+        
+        # Test GET /api/contact/analytics
+        try:
+            response = self.session.get(f"{self.base_url}/contact/analytics?granularity=hour")
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('granularity') == 'hour' and isinstance(data.get('buckets'), list) and data.get('total', 0) >= 1:
+                    self.log_test("GET /api/contact/analytics", True, f"{data['total']} submissions in {len(data['buckets'])} buckets")
+                else:
+                    self.log_test("GET /api/contact/analytics", False, f"Unexpected response: {data}")
+            else:
+                self.log_test("GET /api/contact/analytics", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/contact/analytics", False, f"Exception: {str(e)}")
+        
+        # Test GET /api/contact/analytics with an inverted range
+        try:
+            response = self.session.get(f"{self.base_url}/contact/analytics", params={"start": "2024-02-01T00:00:00Z", "end": "2024-01-01T00:00:00Z"})
+            if response.status_code == 400:
+                self.log_test("GET /api/contact/analytics (invalid range)", True, "Correctly returned 400")
+            else:
+                self.log_test("GET /api/contact/analytics (invalid range)", False, f"Expected 400, got {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/contact/analytics (invalid range)", False, f"Exception: {str(e)}")
+        
+        # Test GET /api/contact/export as NDJSON and CSV
+        try:
+            response = self.session.get(f"{self.base_url}/contact/export")
+            if response.status_code == 200:
+                rows = [json.loads(line) for line in response.text.splitlines() if line]
+                if rows and all(field in rows[0] for field in ['id', 'email', 'timestamp']) and any(row['id'] == contact_id for row in rows):
+                    self.log_test("GET /api/contact/export (ndjson)", True, f"Exported {len(rows)} submissions")
+                else:
+                    self.log_test("GET /api/contact/export (ndjson)", False, "New submission missing from export")
+            else:
+                self.log_test("GET /api/contact/export (ndjson)", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/contact/export (ndjson)", False, f"Exception: {str(e)}")
+        
+        try:
+            response = self.session.get(f"{self.base_url}/contact/export?format=csv")
+            lines = response.text.splitlines()
+            if response.status_code == 200 and lines and lines[0] == "id,name,email,subject,message,status,timestamp":
+                self.log_test("GET /api/contact/export (csv)", True, f"Exported {len(lines) - 1} rows")
+            else:
+                self.log_test("GET /api/contact/export (csv)", False, f"Status: {response.status_code}, Header: {lines[:1]}")
+        except Exception as e:
+            self.log_test("GET /api/contact/export (csv)", False, f"Exception: {str(e)}")
+        
         return True
     
     def test_blog_posts_api(self):
@@ -209,7 +299,69 @@ class PortfolioAPITester:
                 self.log_test("GET /api/blog-posts/categories", False, f"Status: {response.status_code}")
         except Exception as e:
             self.log_test("GET /api/blog-posts/categories", False, f"Exception: {str(e)}")
-        
+
+        # Test GET /api/blog-posts/facets
+        try:
+            response = self.session.get(f"{self.base_url}/blog-posts/facets")
+            if response.status_code == 200:
+                data = response.json()
+                if "categories" in data and "tags" in data:
+                    self.log_test("GET /api/blog-posts/facets", True, f"Retrieved {len(data['categories'])} categories and {len(data['tags'])} tags")
+                else:
+                    self.log_test("GET /api/blog-posts/facets", False, "Missing 'categories' or 'tags' field")
+            else:
+                self.log_test("GET /api/blog-posts/facets", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/blog-posts/facets", False, f"Exception: {str(e)}")
+
+        # Test GET /api/blog-posts cursor pagination
+        try:
+            second_post_data = {**blog_post_data, "title": f"Mentoring Engineers Through Growth {int(time.time())}", "featured": False}
+            self.session.post(f"{self.base_url}/blog-posts", json=second_post_data)
+            # Following the cursor from a one-item page must continue exactly where a two-item page would
+            expected = [item['id'] for item in self.session.get(f"{self.base_url}/blog-posts?limit=2").json()]
+            response = self.session.get(f"{self.base_url}/blog-posts?limit=1")
+            next_cursor = response.headers.get('X-Next-Cursor')
+            if response.status_code != 200:
+                self.log_test("GET /api/blog-posts (cursor)", False, f"Status: {response.status_code}")
+            elif not next_cursor:
+                self.log_test("GET /api/blog-posts (cursor)", False, "Missing X-Next-Cursor header")
+            else:
+                page_2 = self.session.get(f"{self.base_url}/blog-posts", params={"limit": 1, "cursor": next_cursor})
+                pages = [item['id'] for item in response.json() + page_2.json()] if page_2.status_code == 200 else None
+                if len(expected) == 2 and pages == expected:
+                    self.log_test("GET /api/blog-posts (cursor)", True, f"Pages 1 and 2: {pages}")
+                else:
+                    self.log_test("GET /api/blog-posts (cursor)", False, f"Expected {expected}, got {pages} (page 2 status: {page_2.status_code})")
+        except Exception as e:
+            self.log_test("GET /api/blog-posts (cursor)", False, f"Exception: {str(e)}")
+
+        # Test GET /api/blog-posts with a malformed cursor
+        try:
+            response = self.session.get(f"{self.base_url}/blog-posts?cursor=not-a-cursor")
+            if response.status_code == 400:
+                self.log_test("GET /api/blog-posts (invalid cursor)", True, "Correctly returned 400")
+            else:
+                self.log_test("GET /api/blog-posts (invalid cursor)", False, f"Expected 400, got {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/blog-posts (invalid cursor)", False, f"Exception: {str(e)}")
+
+        # Test conditional GET: repeating a request with its ETag returns 304 and no body
+        for path in ["blog-posts", "blog-posts/featured"]:
+            try:
+                response = self.session.get(f"{self.base_url}/{path}")
+                etag = response.headers.get('ETag')
+                if response.status_code != 200 or not etag:
+                    self.log_test(f"GET /api/{path} (If-None-Match)", False, f"Status: {response.status_code}, ETag: {etag}")
+                    continue
+                revalidated = self.session.get(f"{self.base_url}/{path}", headers={'If-None-Match': etag})
+                if revalidated.status_code == 304 and not revalidated.content:
+                    self.log_test(f"GET /api/{path} (If-None-Match)", True, f"304 for ETag {etag}")
+                else:
+                    self.log_test(f"GET /api/{path} (If-None-Match)", False, f"Expected 304, got {revalidated.status_code}")
+            except Exception as e:
+                self.log_test(f"GET /api/{path} (If-None-Match)", False, f"Exception: {str(e)}")
+
         return True
     
     def test_statistics_api(self):
@@ -253,6 +405,21 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("PUT /api/statistics", False, f"Exception: {str(e)}")
         
+        # Test GET /api/statistics/dynamic
+        try:
+            response = self.session.get(f"{self.base_url}/statistics/dynamic?days=7")
+            if response.status_code == 200:
+                data = response.json()
+                required_fields = ['blogPosts', 'testimonials', 'contactSubmissions']
+                if all(field in data for field in required_fields) and len(data['contactSubmissions'].get('byDay', [])) == 7:
+                    self.log_test("GET /api/statistics/dynamic", True, f"Blog posts: {data['blogPosts']['total']}, contact submissions: {data['contactSubmissions']['total']}")
+                else:
+                    self.log_test("GET /api/statistics/dynamic", False, "Missing required fields")
+            else:
+                self.log_test("GET /api/statistics/dynamic", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/statistics/dynamic", False, f"Exception: {str(e)}")
+        
         return True
     
     def test_resume_api(self):
@@ -316,8 +483,9 @@ class PortfolioAPITester:
         print("\n=== Testing Testimonials API ===")
         
         # Test POST /api/testimonials
+        run = int(time.time())
         testimonial_data = {
-            "name": "Priya Sharma",
+            "name": f"Priya Sharma {run}",
             "position": "Product Manager",
             "company": "TechInnovate Solutions",
             "content": "I had the pleasure of working with Dewanshu on a complex AI integration project. His technical expertise and leadership skills are exceptional. He not only delivered high-quality solutions but also mentored the entire team throughout the process. Dewanshu's ability to translate complex technical concepts into business value is remarkable.",
@@ -339,6 +507,16 @@ class PortfolioAPITester:
         except Exception as e:
             self.log_test("POST /api/testimonials", False, f"Exception: {str(e)}")
         
+        # Test that resubmitting the same testimonial is rejected with 429 and Retry-After
+        try:
+            response = self.session.post(f"{self.base_url}/testimonials", json=testimonial_data)
+            if response.status_code == 429 and response.headers.get('Retry-After', '').isdigit():
+                self.log_test("POST /api/testimonials (duplicate)", True, f"429, Retry-After: {response.headers['Retry-After']}s")
+            else:
+                self.log_test("POST /api/testimonials (duplicate)", False, f"Expected 429 with Retry-After, got {response.status_code}, Retry-After: {response.headers.get('Retry-After')}")
+        except Exception as e:
+            self.log_test("POST /api/testimonials (duplicate)", False, f"Exception: {str(e)}")
+        
         # Test GET /api/testimonials
         try:
             response = self.session.get(f"{self.base_url}/testimonials")
@@ -366,6 +544,151 @@ class PortfolioAPITester:
         
         return True
     
+    def test_bulk_import_api(self):
+        """Test bulk import endpoints and their per-item results"""
+        print("\n=== Testing Bulk Import API ===")
+        
+        run = int(time.time())
+        imports = {
+            "blog-posts/bulk": [
+                {
+                    "title": f"Bulk Import Check {run}",
+                    "excerpt": "Imported through the bulk endpoint.",
+                    "content": "Checking that bulk imports report a status for every item.",
+                    "readTime": "1 min read",
+                    "category": "Engineering",
+                    "tags": ["Testing"],
+                    "published": False
+                },
+                {"title": "Missing required fields"}
+            ],
+            "testimonials/bulk": [
+                {
+                    "name": "Arjun Menon",
+                    "position": "Engineering Lead",
+                    "company": f"Bulk Import Check {run}",
+                    "content": "Checking that bulk imports report a status for every item.",
+                    "rating": 5
+                },
+                {"name": "Missing required fields"}
+            ]
+        }
+        
+        # Test that imports are refused without the admin token
+        try:
+            response = self.session.post(f"{self.base_url}/testimonials/bulk", json=imports["testimonials/bulk"])
+            if response.status_code in [401, 403]:
+                self.log_test("POST /api/testimonials/bulk (no admin token)", True, f"Correctly returned {response.status_code}")
+            else:
+                self.log_test("POST /api/testimonials/bulk (no admin token)", False, f"Expected 401/403, got {response.status_code}")
+        except Exception as e:
+            self.log_test("POST /api/testimonials/bulk (no admin token)", False, f"Exception: {str(e)}")
+        
+        if not ADMIN_TOKEN:
+            print("   Skipping authorized imports: ADMIN_TOKEN is not set")
+            return True
+        admin_headers = {'Authorization': f"Bearer {ADMIN_TOKEN}"}
+        
+        for path, items in imports.items():
+            # A second import of the same items matches them on their natural key and updates in place
+            for expected, label in [("inserted", "first import"), ("updated", "re-import")]:
+                try:
+                    response = self.session.post(f"{self.base_url}/{path}", json=items, headers=admin_headers)
+                    if response.status_code != 200:
+                        self.log_test(f"POST /api/{path} ({label})", False, f"Status: {response.status_code}, Response: {response.text}")
+                        break
+                    data = response.json()
+                    statuses = [result['status'] for result in data.get('results', [])]
+                    if statuses == [expected, "invalid"] and data.get(expected) == 1 and data.get('invalid') == 1 and data['results'][1].get('errors'):
+                        self.log_test(f"POST /api/{path} ({label})", True, f"Item statuses: {statuses}")
+                    else:
+                        self.log_test(f"POST /api/{path} ({label})", False, f"Unexpected results: {data}")
+                except Exception as e:
+                    self.log_test(f"POST /api/{path} ({label})", False, f"Exception: {str(e)}")
+        
+        # Test a body that is not a JSON array
+        try:
+            response = self.session.post(f"{self.base_url}/testimonials/bulk", data="not json", headers=admin_headers)
+            if response.status_code == 400:
+                self.log_test("POST /api/testimonials/bulk (invalid body)", True, "Correctly returned 400")
+            else:
+                self.log_test("POST /api/testimonials/bulk (invalid body)", False, f"Expected 400, got {response.status_code}")
+        except Exception as e:
+            self.log_test("POST /api/testimonials/bulk (invalid body)", False, f"Exception: {str(e)}")
+        
+        return True
+    
+    def test_home_api(self):
+        """Test Home API endpoint"""
+        print("\n=== Testing Home API ===")
+        
+        # Test GET /api/home
+        try:
+            response = self.session.get(f"{self.base_url}/home")
+            if response.status_code == 200:
+                data = response.json()
+                required_fields = ['featuredPosts', 'testimonials', 'statistics', 'resume']
+                if all(field in data for field in required_fields):
+                    self.log_test("GET /api/home", True, f"Retrieved {len(data['featuredPosts'])} featured posts and {len(data['testimonials'])} testimonials")
+                else:
+                    self.log_test("GET /api/home", False, "Missing required fields")
+            else:
+                self.log_test("GET /api/home", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/home", False, f"Exception: {str(e)}")
+        
+        return True
+    
+    def test_background_jobs_api(self):
+        """Test background job processing and contact notifications"""
+        print("\n=== Testing Background Jobs API ===")
+        
+        # A unique subject, so neither rate limiting nor duplicate detection rejects a rerun
+        subject = f"Job queue check {int(time.time())}"
+        try:
+            contact_data = {
+                "name": "Meera Iyer",
+                "email": f"meera.{int(time.time())}@example.com",
+                "subject": subject,
+                "message": "Checking that contact notifications are sent in the background."
+            }
+            response = self.session.post(f"{self.base_url}/contact", json=contact_data)
+            if response.status_code != 200:
+                self.log_test("Contact notification", False, f"Status: {response.status_code}")
+            else:
+                # Notifications only land in the outbox when no SMTP relay is configured
+                notified = None
+                for _ in range(10):
+                    outbox = self.session.get(f"{self.base_url}/admin/outbox")
+                    if outbox.status_code != 200:
+                        break
+                    if any(subject in message['subject'] for message in outbox.json()):
+                        notified = True
+                        break
+                    time.sleep(1)
+                if outbox.status_code == 404:
+                    self.log_test("Contact notification", True, "SMTP relay configured, outbox not kept")
+                else:
+                    self.log_test("Contact notification", bool(notified), "Notification found in outbox" if notified else "Notification not sent")
+        except Exception as e:
+            self.log_test("Contact notification", False, f"Exception: {str(e)}")
+        
+        # Test GET /api/admin/jobs
+        try:
+            response = self.session.get(f"{self.base_url}/admin/jobs")
+            if response.status_code == 200:
+                data = response.json()
+                if 'counts' in data and 'recentFailures' in data:
+                    self.log_test("GET /api/admin/jobs", True, f"Job counts: {data['counts']}")
+                else:
+                    self.log_test("GET /api/admin/jobs", False, "Missing required fields")
+            else:
+                self.log_test("GET /api/admin/jobs", False, f"Status: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/admin/jobs", False, f"Exception: {str(e)}")
+        
+        return True
+    
     def test_error_handling(self):
         """Test API error handling"""
         print("\n=== Testing API Error Handling ===")
@@ -423,6 +746,9 @@ class PortfolioAPITester:
         self.test_statistics_api()
         self.test_resume_api()
         self.test_testimonials_api()
+        self.test_bulk_import_api()
+        self.test_home_api()
+        self.test_background_jobs_api()
         self.test_error_handling()
         
         # Summary
@@ -0,0 +1,181 @@
+import asyncio
+import pickle
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+from cache import CachedResponse, MemoryCacheBackend, ResponseCache, dump_entry, load_entry
+
+
+async def list_testimonials(approved: bool = True, featured: Optional[bool] = None):
+    pass
+
+
+ROUTE = APIRoute("/api/testimonials", list_testimonials)
+
+
+def request(query: str = "", headers=(), path: str = "/api/testimonials") -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+        "route": ROUTE,
+    })
+
+
+class CountingLoad:
+    def __init__(self, body: bytes = b"[]"):
+        self.body = body
+        self.calls = 0
+
+    async def __call__(self) -> CachedResponse:
+        self.calls += 1
+        return CachedResponse(body=self.body, etag='"v1"')
+
+
+def test_hits_are_served_without_loading():
+    async def run():
+        cache = ResponseCache(MemoryCacheBackend())
+        load = CountingLoad()
+        first = await cache.get_or_load("testimonials", request(), load)
+        second = await cache.get_or_load("testimonials", request(), load)
+        return load.calls, first, second
+
+    calls, first, second = asyncio.run(run())
+    assert calls == 1
+    assert second is first
+
+
+def test_key_ignores_undeclared_and_reordered_parameters():
+    assert ResponseCache.key_for("t", request("x=1")) == ResponseCache.key_for("t", request())
+    assert ResponseCache.key_for("t", request("featured=true&approved=true")) == ResponseCache.key_for("t", request("approved=true&featured=true&utm=a"))
+    assert ResponseCache.key_for("t", request("featured=true")) != ResponseCache.key_for("t", request())
+
+
+def test_invalidate_drops_only_its_namespace_and_notifies():
+    async def run():
+        published, notified = [], []
+
+        async def publish(namespaces):
+            published.append(namespaces)
+
+        cache = ResponseCache(MemoryCacheBackend(), publish=publish)
+        cache.listeners.append(notified.append)
+        testimonials, posts = CountingLoad(), CountingLoad()
+        await cache.get_or_load("testimonials", request(), testimonials)
+        await cache.get_or_load("blog-posts", request(path="/api/blog-posts"), posts)
+
+        await cache.invalidate("testimonials")
+        await cache.get_or_load("testimonials", request(), testimonials)
+        await cache.get_or_load("blog-posts", request(path="/api/blog-posts"), posts)
+
+        # Invalidations received from other workers are applied without being published again
+        await cache.invalidate("blog-posts", broadcast=False)
+        await cache.get_or_load("blog-posts", request(path="/api/blog-posts"), posts)
+        return testimonials.calls, posts.calls, published, notified
+
+    testimonial_loads, post_loads, published, notified = asyncio.run(run())
+    assert testimonial_loads == 2
+    assert post_loads == 2
+    assert published == [["testimonials"]]
+    assert notified == ["testimonials", "blog-posts"]
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    async def run():
+        cache = ResponseCache(MemoryCacheBackend())
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_load():
+            started.set()
+            await release.wait()
+            return CachedResponse(body=b"stale")
+
+        pending = asyncio.create_task(cache.get_or_load("testimonials", request(), slow_load))
+        await started.wait()
+        await cache.invalidate("testimonials")
+        # A request after the write does not join the load that started before it
+        fresh = await cache.get_or_load("testimonials", request(), CountingLoad(b"fresh"))
+        release.set()
+        stale = await pending
+        cached = await cache.get_or_load("testimonials", request(), CountingLoad(b"reloaded"))
+        return stale, fresh, cached
+
+    stale, fresh, cached = asyncio.run(run())
+    assert stale.body == b"stale"
+    assert fresh.body == b"fresh"
+    assert cached.body == b"fresh"
+
+
+def test_concurrent_misses_share_one_load():
+    async def run():
+        cache = ResponseCache(MemoryCacheBackend())
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return CachedResponse(body=b"[]")
+
+        await asyncio.gather(*[cache.get_or_load("testimonials", request(), load) for _ in range(10)])
+        return calls
+
+    assert asyncio.run(run()) == 1
+
+
+def test_memory_backend_evicts_least_recently_used():
+    async def run():
+        backend = MemoryCacheBackend(max_entries=2)
+        await backend.set("a", CachedResponse(body=b"a"), ttl=60)
+        await backend.set("b", CachedResponse(body=b"b"), ttl=60)
+        await backend.get("a")
+        await backend.set("c", CachedResponse(body=b"c"), ttl=60)
+        return [await backend.get(key) for key in "abc"]
+
+    a, b, c = asyncio.run(run())
+    assert b is None
+    assert a.body == b"a" and c.body == b"c"
+
+
+def test_memory_backend_expires_entries():
+    async def run():
+        backend = MemoryCacheBackend()
+        await backend.set("gone", CachedResponse(body=b"x"), ttl=-1)
+        await backend.set("kept", CachedResponse(body=b"y"), ttl=60)
+        return await backend.get("gone"), await backend.get("kept")
+
+    gone, kept = asyncio.run(run())
+    assert gone is None
+    assert kept.body == b"y"
+
+
+def test_entries_round_trip_as_json_and_reject_pickles():
+    entry = CachedResponse(
+        body=b'{"a": 1}',
+        etag='"v1"',
+        last_modified=datetime(2025, 1, 2, 3, 4, 5),
+        encodings={"gzip": b"\x1f\x8b\x08\x00"},
+    )
+    assert load_entry(dump_entry(entry)) == entry
+    assert load_entry(dump_entry(CachedResponse(body=b""))) == CachedResponse(body=b"")
+    assert load_entry(pickle.dumps(entry)) is None
+    assert load_entry(b"[]") is None
+
+
+def test_not_modified_carries_the_negotiated_validator():
+    entry = CachedResponse(body=b"[]", etag='"v1"', encodings={"gzip": b"compressed"})
+
+    full = entry.to_response(request(headers=[("accept-encoding", "gzip")]))
+    revalidated = entry.to_response(request(headers=[("accept-encoding", "gzip"), ("if-none-match", full.headers["etag"])]))
+    identity = entry.to_response(request(headers=[("if-none-match", '"v1"')]))
+
+    assert full.status_code == 200 and full.headers["content-encoding"] == "gzip"
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == full.headers["etag"] == 'W/"v1"'
+    assert revalidated.headers["vary"] == full.headers["vary"] == "Accept-Encoding"
+    assert identity.status_code == 304 and identity.headers["etag"] == '"v1"'
@@ -0,0 +1,163 @@
+import asyncio
+
+from bson import ObjectId, json_util
+from mongomock_motor import AsyncMongoMockClient
+
+from ingest import ContactIngestQueue, IngestQueueFull
+
+
+def submission(n: int) -> dict:
+    return {"name": "Visitor", "email": f"visitor{n}@example.com", "message": f"Message {n}"}
+
+
+def spool_lines(path) -> list:
+    return [json_util.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def open_queue(path, collection, **options) -> ContactIngestQueue:
+    """A queue with its spool claimed and replayed but no writer task, so batches are written by the test."""
+    queue = ContactIngestQueue(lambda: collection, path, **options)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    queue._spool = queue._claim_spool()
+    queue._read_spool()
+    return queue
+
+
+def test_submissions_are_written_in_batches_and_leave_the_spool(tmp_path):
+    path = tmp_path / "spool.jsonl"
+
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["contact_submissions"]
+        batches = []
+
+        async def on_written(documents):
+            batches.append(len(documents))
+
+        queue = ContactIngestQueue(lambda: collection, path, batch_size=2, flush_interval=0.01, on_written=on_written)
+        await queue.start()
+        ids = [queue.submit(submission(n)) for n in range(5)]
+        while queue.pending:
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        stored = [document["_id"] for document in await collection.find({}).sort("_id", 1).to_list(10)]
+        return ids, stored, batches
+
+    ids, stored, batches = asyncio.run(run())
+    assert stored == sorted(ids)
+    assert sum(batches) == 5 and max(batches) <= 2
+    assert path.read_text(encoding="utf-8") == ""
+
+
+def test_spool_is_replayed_on_start(tmp_path):
+    path = tmp_path / "spool.jsonl"
+    documents = [{"_id": ObjectId(), **submission(n)} for n in range(3)]
+    # The first document is already stored, a crash left the second line twice and the last one torn
+    lines = [json_util.dumps(document) + "\n" for document in documents[:2]]
+    path.write_text(lines[0] + lines[1] + lines[1] + json_util.dumps(documents[2])[:20], encoding="utf-8")
+
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["contact_submissions"]
+        await collection.insert_one(documents[0])
+        written, persisted = [], []
+
+        async def on_written(batch):
+            written.extend(document["_id"] for document in batch)
+
+        async def on_persisted(batch):
+            persisted.extend(document["_id"] for document in batch)
+
+        queue = ContactIngestQueue(lambda: collection, path, flush_interval=0.01, on_written=on_written, on_persisted=on_persisted)
+        await queue.start()
+        assert queue.pending == 2
+        # Appended after the torn line, not onto it
+        late = queue.submit(submission(9))
+        while queue.pending:
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return await collection.count_documents({}), written, persisted, late
+
+    count, written, persisted, late = asyncio.run(run())
+    assert count == 3
+    # Counters only see documents this queue inserted; the idempotent hook sees the whole batch again
+    assert documents[0]["_id"] not in written and documents[1]["_id"] in written and late in written
+    assert documents[0]["_id"] in persisted
+    assert spool_lines(path) == []
+
+
+def test_written_prefix_is_dropped_once_the_tail_fits(tmp_path):
+    path = tmp_path / "spool.jsonl"
+
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["contact_submissions"]
+        queue = open_queue(path, collection)
+        a, b, c = [{**submission(n), "_id": ObjectId()} for n in range(3)]
+        for document in (a, b, c):
+            queue.submit(document)
+
+        # Two unwritten lines would not fit over one dropped line, so the file is left alone
+        await queue._write([a])
+        after_first = [document["_id"] for document in spool_lines(path)]
+        await queue._write([b])
+        after_second = [document["_id"] for document in spool_lines(path)]
+
+        # Offsets stay consistent after the copy, so later batches keep shrinking the file
+        d = {**submission(3), "_id": ObjectId()}
+        queue.submit(d)
+        after_submit = [document["_id"] for document in spool_lines(path)]
+        await queue._write([c, d])
+        after_last = path.read_text(encoding="utf-8")
+        queue._spool.close()
+        return [x["_id"] for x in (a, b, c, d)], after_first, after_second, after_submit, after_last
+
+    (a, b, c, d), after_first, after_second, after_submit, after_last = asyncio.run(run())
+    assert after_first == [a, b, c]
+    assert after_second == [c]
+    assert after_submit == [c, d]
+    assert after_last == ""
+
+
+def test_spool_stays_bounded_while_submissions_keep_arriving(tmp_path):
+    path = tmp_path / "spool.jsonl"
+
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["contact_submissions"]
+        queue = open_queue(path, collection)
+        sizes = []
+        previous = None
+        for n in range(50):
+            current = {**submission(n % 10), "_id": ObjectId()}
+            queue.submit(current)
+            # The queue never drains: one submission is always waiting
+            if previous is not None:
+                await queue._write([previous])
+            sizes.append(path.stat().st_size)
+            previous = current
+        queue._spool.close()
+        return sizes
+
+    sizes = asyncio.run(run())
+    assert max(sizes[10:]) <= 2 * max(sizes[:3])
+
+
+def test_unwritten_batches_stay_spooled_after_stop(tmp_path):
+    path = tmp_path / "spool.jsonl"
+
+    class Unreachable:
+        async def insert_many(self, documents, ordered=True):
+            raise ConnectionError("MongoDB is unreachable")
+
+    async def run():
+        queue = ContactIngestQueue(lambda: Unreachable(), path, flush_interval=10, max_pending=2)
+        await queue.start()
+        ids = [queue.submit(submission(n)) for n in range(2)]
+        try:
+            queue.submit(submission(3))
+            full = False
+        except IngestQueueFull:
+            full = True
+        await queue.stop()
+        return ids, full
+
+    ids, full = asyncio.run(run())
+    assert full
+    assert [document["_id"] for document in spool_lines(path)] == ids
@@ -0,0 +1,163 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+
+def make_queue(collection, **options) -> JobQueue:
+    options = {"backoff": 0.01, "poll_interval": 0.01, "concurrency": 2, **options}
+    return JobQueue(lambda: collection, **options)
+
+
+async def wait_for_status(collection, job_id, status, timeout: float = 2):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        job = await collection.find_one({"_id": job_id})
+        if job and job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach {status}: {job}")
+
+
+def test_enqueued_job_runs_once():
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["jobs"]
+        queue = make_queue(collection)
+        seen = []
+
+        @queue.handler("echo")
+        async def echo(payload):
+            seen.append(payload)
+
+        await queue.start()
+        job_id = await queue.enqueue("echo", {"n": 1})
+        job = await wait_for_status(collection, job_id, DONE)
+        await queue.stop()
+        return seen, job
+
+    seen, job = asyncio.run(run())
+    assert seen == [{"n": 1}]
+    assert job["attempts"] == 1
+
+
+def test_failed_job_is_retried_until_it_succeeds():
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["jobs"]
+        queue = make_queue(collection)
+        calls = 0
+
+        @queue.handler("flaky")
+        async def flaky(payload):
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise RuntimeError("not yet")
+
+        await queue.start()
+        job_id = await queue.enqueue("flaky")
+        job = await wait_for_status(collection, job_id, DONE)
+        await queue.stop()
+        return calls, job
+
+    calls, job = asyncio.run(run())
+    assert calls == 3
+    assert job["attempts"] == 3
+    assert job["lastError"] == "RuntimeError: not yet"
+
+
+def test_job_fails_after_max_attempts():
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["jobs"]
+        queue = make_queue(collection, max_attempts=2)
+
+        @queue.handler("broken")
+        async def broken(payload):
+            raise ValueError("bad payload")
+
+        await queue.start()
+        job_id = await queue.enqueue("broken")
+        job = await wait_for_status(collection, job_id, FAILED)
+        summary = await queue.summary()
+        await queue.stop()
+        return job, summary
+
+    job, summary = asyncio.run(run())
+    assert job["attempts"] == 2
+    assert summary["counts"][FAILED] == 1
+    assert summary["recentFailures"][0]["lastError"] == "ValueError: bad payload"
+
+
+def test_expired_lease_is_reclaimed_and_the_old_holder_cannot_settle_it():
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["jobs"]
+        first = make_queue(collection, lease=60)
+        second = make_queue(collection, lease=60)
+        for queue in (first, second):
+            queue.handler("work")(lambda payload: asyncio.sleep(0))
+
+        await first.enqueue("work")
+        claimed = await first._claim()
+        # Still leased: nobody else may take it
+        assert await second._claim() is None
+
+        # The first worker died; once its lease runs out the job is due again
+        await collection.update_one({"_id": claimed["_id"]}, {"$set": {"runAt": datetime.utcnow() - timedelta(seconds=1)}})
+        reclaimed = await second._claim()
+        await first._finish(claimed, {"status": DONE})
+        stale = await collection.find_one({"_id": claimed["_id"]})
+        await second._execute(reclaimed)
+        settled = await collection.find_one({"_id": claimed["_id"]})
+        return claimed, reclaimed, stale, settled
+
+    claimed, reclaimed, stale, settled = asyncio.run(run())
+    assert reclaimed["_id"] == claimed["_id"]
+    assert reclaimed["lease"] != claimed["lease"]
+    assert reclaimed["attempts"] == 2
+    assert stale["status"] == RUNNING
+    assert settled["status"] == DONE
+
+
+def test_stop_cancels_a_job_still_running_after_the_grace_period():
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["jobs"]
+        queue = make_queue(collection, concurrency=1)
+        started = asyncio.Event()
+
+        @queue.handler("slow")
+        async def slow(payload):
+            started.set()
+            await asyncio.sleep(60)
+
+        await queue.start()
+        job_id = await queue.enqueue("slow")
+        await started.wait()
+        await queue.stop(grace=0.05)
+        return await collection.find_one({"_id": job_id})
+
+    job = asyncio.run(run())
+    # Left leased, so another worker runs it again when the lease expires
+    assert job["status"] == RUNNING
+
+
+def test_enqueue_many_skips_keys_already_queued():
+    async def run():
+        collection = AsyncMongoMockClient()["test"]["jobs"]
+        queue = make_queue(collection)
+        queue.handler("notify")(lambda payload: asyncio.sleep(0))
+
+        await queue.enqueue_many("notify", [("a", {"n": 1}), ("b", {"n": 2})])
+        await queue.enqueue_many("notify", [("b", {"n": 2}), ("c", {"n": 3})])
+        return sorted([job["_id"] async for job in collection.find({"status": QUEUED})])
+
+    assert asyncio.run(run()) == ["notify:a", "notify:b", "notify:c"]
+
+
+def test_enqueue_rejects_unknown_kinds():
+    queue = make_queue(AsyncMongoMockClient()["test"]["jobs"])
+    with pytest.raises(ValueError):
+        asyncio.run(queue.enqueue("missing"))
+    with pytest.raises(ValueError):
+        asyncio.run(queue.enqueue_many("missing", [("a", {})]))
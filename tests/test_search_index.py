@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime
+
+from mongomock_motor import AsyncMongoMockClient
+
+from search_index import BlogSearchIndex, tokenize
+
+
+def post(doc_id, title, content="", tags=(), **fields):
+    return {"_id": doc_id, "title": title, "excerpt": "", "content": content, "tags": list(tags), **fields}
+
+
+def ids(results):
+    return [doc_id for doc_id, _ in results]
+
+
+def test_tokenize_unicode_words_and_unspaced_scripts():
+    assert tokenize("Café au LAIT, naïve résumé") == ["café", "au", "lait", "naïve", "résumé"]
+    assert tokenize("ＡＩ systems") == ["ai", "systems"]
+    assert tokenize("機械学習") == ["機", "械", "学", "習"]
+    assert tokenize("!!! ...") == []
+
+
+def test_rarer_terms_rank_higher():
+    index = BlogSearchIndex()
+    index.add(post("common", "Python tips", "python python"))
+    index.add(post("both", "Python and MongoDB", "indexes"))
+    index.add(post("other", "Python packaging"))
+
+    # "mongodb" appears in one post only, so it outweighs the term every post shares
+    assert ids(index.search("python mongodb"))[0] == "both"
+
+
+def test_title_hits_outrank_body_hits():
+    index = BlogSearchIndex()
+    index.add(post("body", "Team notes", "we talked about leadership today"))
+    index.add(post("title", "Leadership", "we talked about teams today"))
+
+    assert ids(index.search("leadership")) == ["title", "body"]
+
+
+def test_shorter_documents_score_higher_for_the_same_frequency():
+    index = BlogSearchIndex()
+    index.add(post("short", "Scaling", "cloud"))
+    index.add(post("long", "Scaling", "cloud " + "filler " * 200))
+
+    assert ids(index.search("scaling")) == ["short", "long"]
+
+
+def test_prefix_matches_rank_below_exact_matches():
+    index = BlogSearchIndex()
+    index.add(post("prefix", "Scalability"))
+    index.add(post("exact", "Scala"))
+
+    assert ids(index.search("scala")) == ["exact", "prefix"]
+    assert set(ids(index.search("scal"))) == {"exact", "prefix"}
+    # Single characters are matched exactly, never expanded
+    assert index.search("s") == []
+
+
+def test_prefix_expansion_is_capped():
+    index = BlogSearchIndex(max_prefix_terms=2)
+    for i in range(5):
+        index.add(post(f"p{i}", f"term{i}"))
+
+    assert len(index.search("term")) == 2
+
+
+def test_filters_and_date_tiebreak():
+    index = BlogSearchIndex()
+    index.add(post("old", "Cloud", category="DevOps", date=datetime(2024, 1, 1)))
+    index.add(post("new", "Cloud", category="DevOps", date=datetime(2025, 1, 1)))
+    index.add(post("draft", "Cloud", category="Career", published=False, featured=True))
+
+    assert ids(index.search("cloud", category="DevOps")) == ["new", "old"]
+    assert ids(index.search("cloud", published=False)) == ["draft"]
+    assert ids(index.search("cloud", featured=True)) == ["draft"]
+
+
+def test_readding_replaces_and_remove_forgets_terms():
+    index = BlogSearchIndex()
+    index.add(post("a", "Kubernetes"))
+    index.add(post("a", "Terraform"))
+
+    assert index.search("kubernetes") == []
+    assert ids(index.search("terraform")) == ["a"]
+    assert len(index) == 1
+
+    index.remove("a")
+    assert index.search("terraform") == []
+    assert index.search("terr") == []
+    assert len(index) == 0
+
+
+def test_build_scans_the_collection():
+    async def run():
+        posts = AsyncMongoMockClient()["test"]["blog_posts"]
+        await posts.insert_many([post(f"p{i}", f"Post {i}", "shared words") for i in range(3)])
+        index = BlogSearchIndex()
+        assert not index.ready
+        await index.build(posts, batch_size=2)
+        return index
+
+    index = asyncio.run(run())
+    assert index.ready
+    assert len(index.search("shared")) == 3